@@ -10,7 +10,6 @@ Analyzes git diffs to identify and extract Infrastructure as Code changes from:
 
 import argparse
 import json
-import re
 import subprocess
 import sys
 from pathlib import Path
@@ -26,10 +25,10 @@ from diff_helpers import (
 class IaCChangeAnalyzer:
     """Analyzes git diffs for IaC changes."""
 
-    # File patterns for IaC detection
-    TERRAFORM_PATTERNS = [r'\.tf$', r'\.tfvars$']
-    K8S_PATTERNS = [r'\.ya?ml$']
-    CFN_PATTERNS = [r'\.json$', r'\.ya?ml$']
+    # File extensions for IaC detection (tuples so str.endswith checks all at once)
+    TERRAFORM_EXTENSIONS = ('.tf', '.tfvars')
+    K8S_EXTENSIONS = ('.yaml', '.yml')
+    CFN_EXTENSIONS = ('.json', '.yaml', '.yml')
 
     # Kubernetes resource indicators
     K8S_INDICATORS = ['kind:', 'apiVersion:']
@@ -79,11 +78,11 @@ class IaCChangeAnalyzer:
 
     def is_terraform_file(self, file_path: str) -> bool:
         """Check if file is Terraform."""
-        return any(re.search(pattern, file_path) for pattern in self.TERRAFORM_PATTERNS)
+        return file_path.endswith(self.TERRAFORM_EXTENSIONS)
 
     def is_kubernetes_file(self, file_path: str, content: str = None) -> bool:
         """Check if file is Kubernetes manifest."""
-        if not any(re.search(pattern, file_path) for pattern in self.K8S_PATTERNS):
+        if not file_path.endswith(self.K8S_EXTENSIONS):
             return False
         if content:
             return any(indicator in content for indicator in self.K8S_INDICATORS)
@@ -91,7 +90,7 @@ class IaCChangeAnalyzer:
 
     def is_cloudformation_file(self, file_path: str, content: str = None) -> bool:
         """Check if file is CloudFormation template."""
-        if not any(re.search(pattern, file_path) for pattern in self.CFN_PATTERNS):
+        if not file_path.endswith(self.CFN_EXTENSIONS):
             return False
         if content:
             return any(indicator in content for indicator in self.CFN_INDICATORS)
@@ -14,17 +14,239 @@ Categories:
 """
 
 import argparse
+import functools
 import json
 import os
 import re
 import sys
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import yaml
 
+# Prefer the libyaml C parser; fall back to the pure-Python loader
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Prefer RE2 (linear-time, no catastrophic backtracking) for rule patterns
+try:
+    import re2
+    HAS_RE2 = True
+    _RE2_OPTIONS = re2.Options()
+    _RE2_OPTIONS.case_sensitive = False
+    _RE2_OPTIONS.never_capture = True
+    _RE2_OPTIONS.log_errors = False
+except ImportError:
+    HAS_RE2 = False
+
 from defaults import DEFAULT_RULES, DEFAULT_AI_CONFIG, merge_config, get_default_config
 
+# Rule categories in the order they are tried; the first matching rule wins
+CATEGORY_ORDER = ('routine', 'adaptive', 'transformative', 'impact')
+
+# Any of these makes a rule pattern a real regex rather than a plain substring
+_REGEX_META = re.compile(r'[.^$*+?{}\[\]\\|()]')
+
+
+class _LiteralPattern:
+    """Case-insensitive substring matcher for rule patterns without regex syntax."""
+
+    __slots__ = ('needle',)
+
+    def __init__(self, pattern: str):
+        self.needle = pattern.lower()
+
+    def search(self, text: str) -> bool:
+        return self.needle in text.lower()
+
+
+# Number of hex digits after \x, \u and \U in a regex escape
+_HEX_ESCAPE_WIDTHS = {'x': 2, 'u': 4, 'U': 8}
+
+
+def _escape_end(pattern: str, i: int) -> int:
+    """Return the index just past the regex escape starting at ``pattern[i]``.
+
+    Octal escapes and backreferences (``\\101``, ``\\1``), hex escapes
+    (``\\x41``, ``\\u00e9``) and named escapes (``\\N{...}``) span more than
+    the character after the backslash; none of their text may leak into a
+    required literal.
+    """
+    nxt = pattern[i + 1:i + 2]
+    if nxt.isdigit():
+        i += 2
+        while i < len(pattern) and pattern[i].isdigit():
+            i += 1
+        return i
+    if nxt in _HEX_ESCAPE_WIDTHS:
+        return min(i + 2 + _HEX_ESCAPE_WIDTHS[nxt], len(pattern))
+    if nxt == 'N':
+        close = pattern.find('}', i)
+        return close + 1 if close != -1 else len(pattern)
+    return i + 2
+
+
+def _required_literal(pattern: str) -> Optional[str]:
+    """Return the longest word run that every match of ``pattern`` must contain.
+
+    Used to skip rules cheaply before running their regex. Conservative by
+    design: patterns with alternation, groups, character classes or non-ASCII
+    text yield None, escapes always end a run, and a character followed by a
+    ``?``, ``*`` or ``{m,n}`` quantifier is dropped since it may not appear.
+    """
+    if not pattern.isascii() or any(ch in pattern for ch in '|(['):
+        return None
+
+    best = ''
+    run = ''
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch.isalnum() or ch == '_':
+            run += ch
+            i += 1
+            continue
+        if ch in '?*{':
+            run = run[:-1]
+        if len(run) > len(best):
+            best = run
+        run = ''
+        if ch == '{':
+            close = pattern.find('}', i)
+            i = close + 1 if close != -1 else len(pattern)
+        elif ch == '\\':
+            i = _escape_end(pattern, i)
+        else:
+            i += 1
+    if len(run) > len(best):
+        best = run
+    return best.lower() or None
+
+
+# Inline flag groups that turn on MULTILINE, where $ also matches before inner newlines
+_INLINE_MULTILINE = re.compile(r'\(\?[a-zA-Z]*m')
+
+
+def _re2_syntax(pattern: str) -> Optional[str]:
+    """Rewrite an re pattern's end anchors into RE2 syntax.
+
+    re's ``$`` matches at the end of the text and also before a final
+    newline; RE2's ``$`` only matches at the very end, and RE2 has no
+    ``\\Z``. A ``$`` that ends the pattern (or a top-level alternative,
+    possibly inside closing groups) becomes ``(?:\\n?\\z)``: nothing after
+    it can consume the newline, and rules only ask whether a pattern
+    matches. ``\\Z`` becomes ``\\z``. Returns None when a ``$`` is
+    followed by more pattern, or for MULTILINE patterns; those stay on re.
+    """
+    if _INLINE_MULTILINE.search(pattern):
+        return None
+
+    out = []
+    in_class = False
+    depth = 0
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == '\\':
+            escape = pattern[i:i + 2]
+            out.append('\\z' if escape == '\\Z' and not in_class else escape)
+            i += 2
+            continue
+        if in_class:
+            if ch == ']':
+                in_class = False
+        elif ch == '[':
+            in_class = True
+            # A ']' right after '[' or '[^' is a literal member, not the end
+            start = i + 1
+            if pattern[start:start + 1] == '^':
+                start += 1
+            if pattern[start:start + 1] == ']':
+                out.append(pattern[i:start + 1])
+                i = start + 1
+                continue
+        elif ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+        elif ch == '$':
+            rest = pattern[i + 1:]
+            tail = rest.lstrip(')')
+            closed = len(rest) - len(tail)
+            if tail and not (tail[0] == '|' and closed == depth):
+                return None
+            out.append('(?:\\n?\\z)')
+            i += 1
+            continue
+        out.append(ch)
+        i += 1
+    return ''.join(out)
+
+
+def _compile_regex(pattern: str):
+    """Compile a rule regex with RE2 when possible, else with re."""
+    if HAS_RE2:
+        re2_pattern = _re2_syntax(pattern)
+        if re2_pattern is not None:
+            try:
+                return re2.compile(re2_pattern, _RE2_OPTIONS)
+            except re2.error:
+                pass
+    return re.compile(pattern, re.IGNORECASE)
+
+
+def _compile_matcher(pattern: str) -> Any:
+    """Compile a rule pattern into a case-insensitive matcher.
+
+    ASCII patterns with no regex metacharacters become plain substring
+    checks. Other patterns go to RE2 when it is installed, falling back to
+    re.IGNORECASE for syntax RE2 lacks (backreferences, lookarounds) and
+    for MULTILINE patterns.
+    """
+    if pattern.isascii() and not _REGEX_META.search(pattern):
+        return _LiteralPattern(pattern)
+    return _compile_regex(pattern)
+
+
+def _build_rule_table(rules: Dict, compiled: Dict[str, Any],
+                      literals: Dict[str, Optional[str]]) -> List[Tuple[str, Dict, str]]:
+    """Flatten rules into priority order, compiling their patterns into ``compiled``.
+
+    Each entry is (CATEGORY, rule, literal) where literal is the longest
+    string any of the rule's patterns requires ('' when none), used to
+    prefilter rules before any regex runs.
+    """
+    table = []
+    for category in CATEGORY_ORDER:
+        for rule in rules.get(category) or []:
+            literal = ''
+            for key in ('pattern', 'resource', 'attribute'):
+                if key in rule:
+                    source = rule[key]
+                    if source not in compiled:
+                        compiled[source] = _compile_matcher(source)
+                    if source not in literals:
+                        literals[source] = _required_literal(source)
+                    literal = max(literal, literals[source] or '', key=len)
+            table.append((category.upper(), rule, literal))
+    return table
+
+
+@functools.lru_cache(maxsize=None)
+def _default_rule_state() -> Tuple[Dict[str, Any], Dict[str, Optional[str]], List[Tuple[str, Dict, str]]]:
+    """Compiled patterns, literals and rule table for DEFAULT_RULES, built once per process."""
+    compiled: Dict[str, Any] = {}
+    literals: Dict[str, Optional[str]] = {}
+    return compiled, literals, _build_rule_table(DEFAULT_RULES, compiled, literals)
+
 
 class ChangeClassifier:
     """Classifies IaC changes according to FedRAMP SCN guidelines."""
@@ -43,6 +265,17 @@ class ChangeClassifier:
         self.config = merge_config(config or {}, default_config)
 
         self.rules = self.config.get('rules', DEFAULT_RULES)
+        # Compile every rule pattern once up front; matching looks them up by source.
+        # Classifiers on the default rules copy one shared compiled set.
+        if self.rules is DEFAULT_RULES:
+            compiled, literals, self._rule_table = _default_rule_state()
+            self._compiled_patterns: Dict[str, Any] = dict(compiled)
+            self._required_literals: Dict[str, Optional[str]] = dict(literals)
+        else:
+            self._compiled_patterns = {}
+            self._required_literals = {}
+            self._rule_table = _build_rule_table(self.rules, self._compiled_patterns,
+                                                 self._required_literals)
         self.ai_config = self.config.get('ai_fallback', DEFAULT_AI_CONFIG)
         # AI enablement is controlled exclusively by the --enable-ai CLI flag
         # (or the enable_ai_fallback action input). Config files cannot enable AI.
@@ -67,21 +300,23 @@ class ChangeClassifier:
             )
         return self._ai_classifier
 
-    def load_config_from_file(self, config_path: str) -> Optional[Dict]:
+    @staticmethod
+    def load_config_from_file(config_path: str) -> Optional[Dict]:
         """Load configuration from YAML file.
 
         Returns:
             Parsed config dict, empty dict if file not found, or None if YAML/validation is invalid.
         """
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f)
+            # libyaml decodes the raw bytes itself, so skip the text-mode decode
+            with open(config_path, 'rb') as f:
+                config = yaml.load(f.read(), Loader=_SafeLoader)
                 if not isinstance(config, dict):
                     print(f"⚠️  Config file is empty or not a YAML mapping: {config_path}", file=sys.stderr)
                     return {}
 
                 # Validate config structure against schema
-                self._validate_config(config)
+                ChangeClassifier._validate_config(config)
 
                 print(f"✅ Loaded config from {config_path}")
                 return config
@@ -102,17 +337,33 @@ class ChangeClassifier:
         from validate_scn_config import validate_config_structure
         schema_path = Path(__file__).parent.parent / 'schemas' / 'scn-config.schema.json'
         if schema_path.exists():
-            with open(schema_path, 'r', encoding='utf-8') as sf:
-                schema = json.load(sf)
+            with open(schema_path, 'rb') as sf:
+                schema = orjson.loads(sf.read()) if HAS_ORJSON else json.load(sf)
             validate_config_structure(config, schema)
 
-    def match_rule(self, change: Dict, rule: Dict) -> bool:
+    def _matcher(self, pattern: str) -> Any:
+        """Return the compiled case-insensitive matcher for a rule pattern."""
+        compiled = self._compiled_patterns.get(pattern)
+        if compiled is None:
+            compiled = self._compiled_patterns[pattern] = _compile_matcher(pattern)
+        return compiled
+
+    @staticmethod
+    def _match_text(change: Dict) -> str:
+        """Build the text that 'pattern' rules are searched against."""
+        return (
+            f"{change.get('type', '')}.{change.get('name', '')} "
+            f"{' '.join(change.get('attributes_changed', []))} {change.get('diff', '')}"
+        )
+
+    def match_rule(self, change: Dict, rule: Dict, match_text: Optional[str] = None) -> bool:
         """
         Check if a change matches a rule.
 
         Args:
             change: Change dictionary with resource info
             rule: Rule dictionary with matching criteria
+            match_text: Precomputed _match_text(change), reused across rules
 
         Returns:
             True if rule matches
@@ -123,8 +374,11 @@ class ChangeClassifier:
         attributes = change.get('attributes_changed', [])
         diff = change.get('diff', '')
 
-        if not self._match_pattern(rule, resource_type, resource_name, attributes, diff):
-            return False
+        if 'pattern' in rule:
+            if match_text is None:
+                match_text = self._match_text(change)
+            if not self._matcher(rule['pattern']).search(match_text):
+                return False
         if not self._match_resource(rule, resource_type, resource_name, attributes):
             return False
         if not self._match_attribute(rule, attributes, diff):
@@ -134,14 +388,6 @@ class ChangeClassifier:
 
         return True
 
-    def _match_pattern(self, rule: Dict, resource_type: str, resource_name: str,
-                       attributes: List[str], diff: str) -> bool:
-        """Check pattern match criterion."""
-        if 'pattern' not in rule:
-            return True
-        match_text = f"{resource_type}.{resource_name} {' '.join(attributes)} {diff}"
-        return bool(re.search(rule['pattern'], match_text, re.IGNORECASE))
-
     def _match_resource(self, rule: Dict, resource_type: str, resource_name: str,
                         attributes: List[str]) -> bool:
         """Check resource type/name match criterion."""
@@ -149,15 +395,16 @@ class ChangeClassifier:
             return True
 
         resource_pattern = rule['resource']
+        resource_regex = self._matcher(resource_pattern)
         full_resource = f"{resource_type}.{resource_name}"
 
-        matched = re.search(resource_pattern, full_resource, re.IGNORECASE)
+        matched = resource_regex.search(full_resource)
 
         # Try matching with attributes: type.name.attribute
         if not matched and resource_pattern.count('.') >= 2 and attributes:
             for attr in attributes:
                 full_resource_with_attr = f"{resource_type}.{resource_name}.{attr}"
-                if re.search(resource_pattern, full_resource_with_attr, re.IGNORECASE):
+                if resource_regex.search(full_resource_with_attr):
                     return True
 
         return bool(matched)
@@ -166,12 +413,12 @@ class ChangeClassifier:
         """Check attribute match criterion."""
         if 'attribute' not in rule:
             return True
-        attribute_pattern = rule['attribute']
+        attribute_regex = self._matcher(rule['attribute'])
         has_matching_attr = any(
-            re.search(attribute_pattern, attr, re.IGNORECASE)
+            attribute_regex.search(attr)
             for attr in attributes
         )
-        has_matching_diff = re.search(attribute_pattern, diff, re.IGNORECASE)
+        has_matching_diff = attribute_regex.search(diff)
         return bool(has_matching_attr or has_matching_diff)
 
     def _match_operation(self, rule: Dict, operation: str) -> bool:
@@ -187,10 +434,19 @@ class ChangeClassifier:
 
     def classify_with_rules(self, change: Dict) -> Optional[Tuple[str, Dict]]:
         """Classify change using rule-based matching."""
-        for category in ['routine', 'adaptive', 'transformative', 'impact']:
-            for rule in self.rules.get(category, []):
-                if self.match_rule(change, rule):
-                    return (category.upper(), rule)
+        # Built once per change and shared by every rule. Every string a rule
+        # regex is searched against is a substring of this text (or is split
+        # from it at non-word characters), so a required
+        # literal missing here rules the rule out. Only ASCII text is
+        # prefiltered: re.IGNORECASE folds a few non-ASCII letters onto ASCII.
+        match_text = self._match_text(change)
+        haystack = match_text.lower() if match_text.isascii() else None
+
+        for category, rule, literal in self._rule_table:
+            if haystack is not None and literal not in haystack:
+                continue
+            if self.match_rule(change, rule, match_text):
+                return (category, rule)
         return None
 
     def classify_with_ai(self, change: Dict) -> Dict:
@@ -246,6 +502,17 @@ class ChangeClassifier:
             parts.append(f"attr:{rule['attribute']}")
         return '.'.join(parts)
 
+    @staticmethod
+    def _change_key(change: Dict) -> Tuple:
+        """Key covering every change field that rules or the AI prompt read."""
+        return (
+            change.get('type', ''),
+            change.get('name', ''),
+            change.get('operation', ''),
+            tuple(change.get('attributes_changed') or ()),
+            change.get('diff', ''),
+        )
+
     def classify_all_changes(self, changes_data: Dict) -> Dict:
         """Classify all changes in dataset."""
         print("🏷️  Classifying changes...")
@@ -257,10 +524,18 @@ class ChangeClassifier:
             'manual_review': 0
         }
 
+        # Identical changes (same resource, operation, attributes and diff, e.g.
+        # a module rendered into several files) are classified only once
+        seen: Dict[Tuple, Dict] = {}
+
         for file_change in changes_data.get('changes', []):
             file_path = file_change.get('file')
             for resource in file_change.get('resources', []):
-                classification = self.classify_change(resource)
+                key = self._change_key(resource)
+                cached = seen.get(key)
+                if cached is None:
+                    cached = seen[key] = self.classify_change(resource)
+                classification = dict(cached)
                 classification['file'] = file_path
                 classification['resource'] = f"{resource.get('type')}.{resource.get('name')}"
                 classifications.append(classification)
@@ -292,7 +567,7 @@ def main():
     parser = argparse.ArgumentParser(
         description='Classify IaC changes for FedRAMP SCN'
     )
-    parser.add_argument('--input', required=True, help='Input JSON file')
+    parser.add_argument('--input', required=True, help='Input JSON file (- for stdin)')
     parser.add_argument('--output', required=True, help='Output JSON file')
     parser.add_argument('--config', help='Path to SCN configuration YAML')
     parser.add_argument('--ai-config', help='Path to AI configuration YAML (overrides AI settings)')
@@ -300,9 +575,14 @@ def main():
 
     args = parser.parse_args()
 
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError
     try:
-        with open(args.input, 'r', encoding='utf-8') as f:
-            changes_data = json.load(f)
+        if args.input == '-':
+            raw = sys.stdin.buffer.read()
+        else:
+            with open(args.input, 'rb') as f:
+                raw = f.read()
+        changes_data = orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
     except FileNotFoundError:
         print(f"❌ Input file not found: {args.input}", file=sys.stderr)
         return 1
@@ -313,8 +593,7 @@ def main():
     # Load profile config
     config = None
     if args.config:
-        classifier = ChangeClassifier()
-        config = classifier.load_config_from_file(args.config)
+        config = ChangeClassifier.load_config_from_file(args.config)
         if config is None:
             print(f"❌ Cannot proceed with invalid config file: {args.config}", file=sys.stderr)
             return 1
@@ -322,8 +601,8 @@ def main():
     # Load and merge AI config if provided (highest priority for AI settings)
     if args.ai_config:
         try:
-            with open(args.ai_config, 'r', encoding='utf-8') as f:
-                ai_config_override = yaml.safe_load(f)
+            with open(args.ai_config, 'rb') as f:
+                ai_config_override = yaml.load(f.read(), Loader=_SafeLoader)
 
                 if not isinstance(ai_config_override, dict):
                     print(f"❌ AI config file is empty or not a YAML mapping: {args.ai_config}", file=sys.stderr)
@@ -364,14 +643,22 @@ def main():
         env_var = provider_cls.ENV_VAR if provider_cls else 'ANTHROPIC_API_KEY'
         print(f"⚠️  AI fallback enabled but {env_var} not set", file=sys.stderr)
 
-    classifier = ChangeClassifier(config=config, enable_ai=args.enable_ai, api_key=api_key)
+    try:
+        classifier = ChangeClassifier(config=config, enable_ai=args.enable_ai, api_key=api_key)
+    except re.error as e:
+        print(f"❌ Invalid rule pattern {e.pattern!r} in config: {e}", file=sys.stderr)
+        return 1
     results = classifier.classify_all_changes(changes_data)
 
     output_path = Path(args.output)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(results, f, indent=2)
+    if HAS_ORJSON:
+        with open(output_path, 'wb') as f:
+            f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
 
     print(f"\n✅ Classification complete: {output_path}")
     return 0
@@ -14,28 +14,42 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional
 
-import requests
+
+# Issue labels by category
+CATEGORY_LABELS = {
+    'ADAPTIVE': ['scn', 'scn:adaptive', 'compliance'],
+    'TRANSFORMATIVE': ['scn', 'scn:transformative', 'compliance'],
+    'IMPACT': ['scn', 'scn:impact', 'compliance'],
+    'MANUAL_REVIEW': ['scn', 'scn:manual-review', 'needs-triage']
+}
+
+# Emoji indicators
+CATEGORY_EMOJIS = {
+    'ADAPTIVE': '🟡',
+    'TRANSFORMATIVE': '🟠',
+    'IMPACT': '🔴',
+    'MANUAL_REVIEW': '⚠️'
+}
+
+# HTTP connection pooling and retry policy for the GitHub API. Issue, label
+# and GraphQL writes are POSTs and are not idempotent (a 502/504 often means
+# the write already happened), so only connection failures are retried for
+# them; status and read retries apply to idempotent methods only.
+HTTP_POOL_SIZE = 8
+HTTP_RETRY_TOTAL = 3
+HTTP_RETRY_BACKOFF = 0.5
+HTTP_RETRY_STATUSES = [429, 500, 502, 503, 504]
+
+# Maximum createIssue mutations sent in a single GraphQL request. GitHub
+# runs the aliased mutations one after another, so the request timeout
+# grows by GRAPHQL_TIMEOUT_PER_ISSUE seconds for each issue in the batch.
+GRAPHQL_BATCH_SIZE = 20
+GRAPHQL_TIMEOUT_PER_ISSUE = 5
 
 
 class SCNIssueCreator:
     """Creates GitHub Issues for SCN tracking."""
 
-    # Issue labels by category
-    CATEGORY_LABELS = {
-        'ADAPTIVE': ['scn', 'scn:adaptive', 'compliance'],
-        'TRANSFORMATIVE': ['scn', 'scn:transformative', 'compliance'],
-        'IMPACT': ['scn', 'scn:impact', 'compliance'],
-        'MANUAL_REVIEW': ['scn', 'scn:manual-review', 'needs-triage']
-    }
-
-    # Emoji indicators
-    CATEGORY_EMOJIS = {
-        'ADAPTIVE': '🟡',
-        'TRANSFORMATIVE': '🟠',
-        'IMPACT': '🔴',
-        'MANUAL_REVIEW': '⚠️'
-    }
-
     def __init__(self, github_token: str, repo: str, server_url: str = 'https://github.com'):
         """
         Initialize issue creator.
@@ -53,6 +67,49 @@ class SCNIssueCreator:
         # If not github.com, assume GHES with /api/v3 path
         if 'api.github.com' not in self.api_url:
             self.api_url = f"{server_url}/api/v3"
+            self.graphql_url = f"{server_url}/api/graphql"
+        else:
+            self.graphql_url = f"{self.api_url}/graphql"
+
+        # HTTP session is created on first use (see the session property)
+        self._session = None
+
+        # GraphQL node IDs, fetched once and reused across batches
+        self._repository_id = None
+        self._label_ids = {}
+
+        # Issues whose GraphQL request failed and were not retried
+        self.failed_issue_count = 0
+
+    @property
+    def session(self):
+        """Pooled HTTP session for the GitHub API, created on first use."""
+        if self._session is None:
+            # Import here so runs that create no issues skip loading the network stack
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            session = requests.Session()
+            session.headers.update({
+                'Authorization': f'token {self.github_token}',
+                'Accept': 'application/vnd.github.v3+json'
+            })
+            retry = Retry(
+                total=HTTP_RETRY_TOTAL,
+                backoff_factor=HTTP_RETRY_BACKOFF,
+                status_forcelist=HTTP_RETRY_STATUSES,
+                raise_on_status=False
+            )
+            adapter = HTTPAdapter(
+                pool_connections=HTTP_POOL_SIZE,
+                pool_maxsize=HTTP_POOL_SIZE,
+                max_retries=retry
+            )
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            self._session = session
+        return self._session
 
     def calculate_due_dates(self, category: str) -> Dict[str, str]:
         """
@@ -109,7 +166,7 @@ class SCNIssueCreator:
 
     def generate_issue_title(self, category: str, resource: str) -> str:
         """Generate issue title."""
-        emoji = self.CATEGORY_EMOJIS.get(category, '')
+        emoji = CATEGORY_EMOJIS.get(category, '')
         return f"{emoji} FedRAMP SCN: {category.capitalize()} Change - {resource}"
 
     def generate_issue_body(self, classification: Dict, pr_number: int,
@@ -127,7 +184,7 @@ class SCNIssueCreator:
             Issue body markdown
         """
         category = classification.get('category')
-        emoji = self.CATEGORY_EMOJIS.get(category, '')
+        emoji = CATEGORY_EMOJIS.get(category, '')
         resource = classification.get('resource', 'unknown')
         file_path = classification.get('file', 'unknown')
         method = classification.get('method', 'unknown')
@@ -245,13 +302,9 @@ class SCNIssueCreator:
         Returns:
             Issue number if successful, None otherwise
         """
-        url = f"{self.api_url}/repos/{self.repo}/issues"
+        import requests
 
-        headers = {
-            'Authorization': f'token {self.github_token}',
-            'Accept': 'application/vnd.github.v3+json',
-            'Content-Type': 'application/json'
-        }
+        url = f"{self.api_url}/repos/{self.repo}/issues"
 
         data = {
             'title': title,
@@ -260,7 +313,7 @@ class SCNIssueCreator:
         }
 
         try:
-            response = requests.post(url, headers=headers, json=data, timeout=30)
+            response = self.session.post(url, json=data, timeout=30)
             response.raise_for_status()
 
             issue_data = response.json()
@@ -278,6 +331,194 @@ class SCNIssueCreator:
             print(f"  ❌ Error creating issue: {e}", file=sys.stderr)
             return None
 
+    def _graphql(self, query: str, variables: Dict, timeout: int = 30) -> Dict:
+        """
+        POST a GraphQL request.
+
+        Args:
+            query: GraphQL query or mutation
+            variables: Query variables
+            timeout: Request timeout in seconds
+
+        Returns:
+            Parsed response payload (may contain both 'data' and 'errors')
+
+        Raises:
+            requests.RequestException: On transport or HTTP errors
+        """
+        response = self.session.post(
+            self.graphql_url,
+            json={'query': query, 'variables': variables},
+            timeout=timeout
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def _resolve_node_ids(self, labels: List[str]) -> bool:
+        """
+        Fetch the repository ID and label IDs needed for createIssue mutations.
+
+        Labels missing from the repository are created once via REST.
+
+        Args:
+            labels: Label names used by the pending issues
+
+        Returns:
+            True if every node ID is available, False otherwise
+        """
+        missing = [name for name in labels if name not in self._label_ids]
+        if self._repository_id and not missing:
+            return True
+
+        owner, _, name = self.repo.partition('/')
+        label_fields = ' '.join(
+            f'l{i}: label(name: $l{i}) {{ id }}' for i in range(len(missing))
+        )
+        label_params = ''.join(f', $l{i}: String!' for i in range(len(missing)))
+        query = (
+            f'query($owner: String!, $name: String!{label_params}) '
+            f'{{ repository(owner: $owner, name: $name) {{ id {label_fields} }} }}'
+        )
+        variables = {'owner': owner, 'name': name}
+        variables.update({f'l{i}': label for i, label in enumerate(missing)})
+
+        result = self._graphql(query, variables)
+        repository = (result.get('data') or {}).get('repository')
+        if not repository:
+            print(f"  ⚠️  GraphQL repository lookup failed: {result.get('errors')}", file=sys.stderr)
+            return False
+
+        self._repository_id = repository['id']
+        for i, label in enumerate(missing):
+            node = repository.get(f'l{i}')
+            if node:
+                self._label_ids[label] = node['id']
+                continue
+
+            # REST label creation returns the GraphQL node_id directly
+            response = self.session.post(
+                f"{self.api_url}/repos/{self.repo}/labels",
+                json={'name': label},
+                timeout=30
+            )
+            response.raise_for_status()
+            self._label_ids[label] = response.json()['node_id']
+
+        return True
+
+    def _create_issues_graphql(self, issues: List[Dict]) -> List[Optional[int]]:
+        """
+        Create up to GRAPHQL_BATCH_SIZE issues with one aliased GraphQL mutation.
+
+        Issues go through REST instead only when GitHub reports that they
+        were not created: the node ID lookup failed before any mutation was
+        sent, the request was rejected before execution (no 'data'), or an
+        alias came back null.
+
+        Args:
+            issues: List of dicts with 'title', 'body' and 'labels'
+
+        Returns:
+            Issue number (or None on failure) for each input issue, in order
+
+        Raises:
+            requests.RequestException, ValueError: If the mutation request
+                fails in transport or returns an unreadable body; GitHub may
+                already have created some of the issues
+        """
+        import requests
+
+        try:
+            resolved = self._resolve_node_ids(sorted({l for issue in issues for l in issue['labels']}))
+        except (requests.RequestException, KeyError, ValueError) as e:
+            print(f"  ⚠️  GraphQL node ID lookup failed: {e}", file=sys.stderr)
+            resolved = False
+        if not resolved:
+            return [self.create_issue(issue['title'], issue['body'], issue['labels']) for issue in issues]
+
+        params = ['$repo: ID!']
+        mutations = []
+        variables = {'repo': self._repository_id}
+        for i, issue in enumerate(issues):
+            params.append(f'$t{i}: String!, $b{i}: String, $l{i}: [ID!]')
+            mutations.append(
+                f'i{i}: createIssue(input: {{repositoryId: $repo, title: $t{i}, '
+                f'body: $b{i}, labelIds: $l{i}}}) {{ issue {{ number }} }}'
+            )
+            variables[f't{i}'] = issue['title']
+            variables[f'b{i}'] = issue['body']
+            variables[f'l{i}'] = [self._label_ids[label] for label in issue['labels']]
+
+        query = f"mutation({', '.join(params)}) {{ {' '.join(mutations)} }}"
+        result = self._graphql(query, variables,
+                               timeout=30 + GRAPHQL_TIMEOUT_PER_ISSUE * len(issues))
+
+        if result.get('errors'):
+            print(f"  ⚠️  GraphQL createIssue errors: {result['errors']}", file=sys.stderr)
+
+        data = result.get('data')
+        if data is None and not result.get('errors'):
+            raise ValueError('GraphQL createIssue response has neither data nor errors')
+
+        numbers = []
+        for i, issue in enumerate(issues):
+            alias = f'i{i}'
+            if data is not None and alias not in data:
+                # Outcome unknown: the issue may exist, so do not create it again
+                print(f"  ⚠️  No createIssue result for {issue['title']}; not retried", file=sys.stderr)
+                numbers.append(None)
+                continue
+            created = (data or {}).get(alias) or {}
+            number = (created.get('issue') or {}).get('number')
+            if number:
+                print(f"  ✅ Created issue #{number}: {issue['title']}")
+            else:
+                number = self.create_issue(issue['title'], issue['body'], issue['labels'])
+            numbers.append(number)
+
+        return numbers
+
+    def create_issues_batch(self, issues: List[Dict]) -> List[int]:
+        """
+        Create multiple GitHub Issues, batching them through GraphQL.
+
+        Issues are sent in chunks of GRAPHQL_BATCH_SIZE aliased createIssue
+        mutations. Issues GitHub reports as not created fall back to the REST
+        endpoint. A chunk whose mutation request fails in transport is not
+        replayed, since GitHub may already have created its issues; its
+        issues are added to failed_issue_count instead. A single
+        issue goes straight to REST, since the GraphQL path needs an extra
+        node ID lookup.
+
+        Args:
+            issues: List of dicts with 'title', 'body' and 'labels'
+
+        Returns:
+            List of created issue numbers
+        """
+        if len(issues) == 1:
+            issue = issues[0]
+            number = self.create_issue(issue['title'], issue['body'], issue['labels'])
+            return [number] if number else []
+
+        import requests
+
+        issue_numbers = []
+        for start in range(0, len(issues), GRAPHQL_BATCH_SIZE):
+            chunk = issues[start:start + GRAPHQL_BATCH_SIZE]
+
+            try:
+                results = self._create_issues_graphql(chunk)
+            except (requests.RequestException, ValueError) as e:
+                print(f"  ❌ GraphQL createIssue request failed, {len(chunk)} issue(s) not retried "
+                      f"to avoid duplicates: {e}", file=sys.stderr)
+                self.failed_issue_count += len(chunk)
+                continue
+
+            issue_numbers.extend(number for number in results if number)
+
+        return issue_numbers
+
     def create_issues_for_classifications(self, classifications: List[Dict],
                                           pr_number: int, run_id: str,
                                           dry_run: bool = False) -> tuple:
@@ -293,6 +534,10 @@ class SCNIssueCreator:
         Returns:
             Tuple of (issue_numbers, dry_run_issues)
         """
+        if not classifications:
+            print("ℹ️  No classifications to process, skipping issue creation")
+            return ([], [])
+
         if dry_run:
             print("📋 [DRY-RUN] Simulating GitHub Issue creation...")
         else:
@@ -300,6 +545,7 @@ class SCNIssueCreator:
 
         issue_numbers = []
         dry_run_issues = []
+        pending_issues = []
 
         # Group by category
         grouped = {}
@@ -325,15 +571,17 @@ class SCNIssueCreator:
 
         # Create issues
         for category, items in grouped.items():
-            print(f"\n{self.CATEGORY_EMOJIS.get(category, '')} {category.capitalize()} changes: {len(items)}")
+            print(f"\n{CATEGORY_EMOJIS.get(category, '')} {category.capitalize()} changes: {len(items)}")
+
+            # Labels and due dates depend only on the category
+            labels = CATEGORY_LABELS.get(category, ['scn'])
+            due_dates = self.calculate_due_dates(category)
 
             for classification in items:
                 resource = classification.get('resource', 'unknown')
-                due_dates = self.calculate_due_dates(category)
 
                 title = self.generate_issue_title(category, resource)
                 body = self.generate_issue_body(classification, pr_number, run_id, due_dates)
-                labels = self.CATEGORY_LABELS.get(category, ['scn'])
 
                 if dry_run:
                     print(f"  [DRY-RUN] Would create issue: {title}")
@@ -346,9 +594,14 @@ class SCNIssueCreator:
                         'due_dates': due_dates
                     })
                 else:
-                    issue_number = self.create_issue(title, body, labels)
-                    if issue_number:
-                        issue_numbers.append(issue_number)
+                    pending_issues.append({
+                        'title': title,
+                        'body': body,
+                        'labels': labels
+                    })
+
+        if pending_issues:
+            issue_numbers = self.create_issues_batch(pending_issues)
 
         if dry_run:
             print(f"\n✅ [DRY-RUN] Would create {len(dry_run_issues)} issue(s)")
@@ -461,6 +714,11 @@ def main():
 
         print(f"\n✅ Issue numbers written to: {output_path}")
 
+    if creator.failed_issue_count:
+        print(f"❌ {creator.failed_issue_count} issue(s) may not have been created; "
+              "check the repository before re-running", file=sys.stderr)
+        return 1
+
     return 0
 
 
@@ -9,10 +9,44 @@ from SCN classification results.
 import argparse
 import json
 import sys
-from datetime import datetime, timedelta
+from datetime import datetime, timezone
+from functools import cached_property
 from pathlib import Path
 from typing import Dict, List
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+# Static markdown fragments, built once at import time
+_SUMMARY_HEADER = (
+    "| Category | Count | Notification Required | Timeline |\n"
+    "|----------|-------|----------------------|----------|\n"
+)
+
+# Summary table rows in order: Impact → Transformative → Adaptive → Routine
+_SUMMARY_ROWS = (
+    ('IMPACT', 'impact', 'New Assessment Required'),
+    ('TRANSFORMATIVE', 'transformative', 'Yes'),
+    ('ADAPTIVE', 'adaptive', 'Yes'),
+    ('ROUTINE', 'routine', 'No'),
+)
+
+_PR_COMMENT_HEADER = (
+    "<details>\n"
+    "<summary>🔐 FedRAMP Significant Change Notification (SCN) Analysis</summary>\n\n"
+    "## 📊 Change Summary\n\n"
+)
+
+_PR_COMMENT_FOOTER = (
+    "\n---\n\n"
+    "*Generated by [Argus SCN Detector](https://github.com/huntridge-labs/argus) v0.3.0*\n\n"
+    "</details>\n"
+)
+
 
 class SCNReportGenerator:
     """Generates SCN reports in multiple formats."""
@@ -53,8 +87,42 @@ class SCNReportGenerator:
         self.run_id = run_id
         self.server_url = server_url
 
+        # Single analysis timestamp shared by the markdown and JSON outputs
+        self._now_iso = datetime.now(timezone.utc).replace(tzinfo=None).isoformat(
+            timespec='seconds'
+        ) + 'Z'
+
+        # Derived values that only depend on the input data
+        self._timeline_strings = {
+            category: self.format_timeline_requirements(category)
+            for category in ('IMPACT', 'TRANSFORMATIVE', 'ADAPTIVE', 'ROUTINE')
+        }
+
+    @cached_property
+    def _model(self) -> Dict:
+        """
+        Materialize the data shared by the markdown and JSON renderers.
+
+        Built once on first use so generate_pr_comment and generate_audit_json
+        share a single pass over the classifications.
+        """
+        # Bucket classifications by category in a single pass
+        by_category: Dict[str, List[Dict]] = {}
+        for classification in self.classifications:
+            by_category.setdefault(classification.get('category'), []).append(classification)
+
+        return {
+            'by_category': by_category,
+            'highest_severity': self._compute_highest_severity(),
+            'compliance_actions': self._generate_compliance_actions()
+        }
+
     def get_highest_severity(self) -> str:
         """Get highest severity category detected."""
+        return self._model['highest_severity']
+
+    def _compute_highest_severity(self) -> str:
+        """Determine highest severity category from the summary counts."""
         if self.summary.get('impact', 0) > 0:
             return 'IMPACT'
         elif self.summary.get('transformative', 0) > 0:
@@ -86,80 +154,73 @@ class SCNReportGenerator:
 
     def generate_summary_table(self) -> str:
         """Generate markdown summary table."""
-        table = """| Category | Count | Notification Required | Timeline |
-|----------|-------|----------------------|----------|
-"""
-
-        # Add rows in order: Impact → Transformative → Adaptive → Routine
-        categories = [
-            ('IMPACT', 'impact', 'New Assessment Required'),
-            ('TRANSFORMATIVE', 'transformative', 'Yes'),
-            ('ADAPTIVE', 'adaptive', 'Yes'),
-            ('ROUTINE', 'routine', 'No')
-        ]
+        parts = [_SUMMARY_HEADER]
 
-        for category, key, notification in categories:
+        for category, key, notification in _SUMMARY_ROWS:
             count = self.summary.get(key, 0)
             emoji = self.SEVERITY_EMOJIS.get(category, '')
-            timeline = self.format_timeline_requirements(category)
+            timeline = self._timeline_strings[category]
 
-            table += f"| {emoji} **{category.capitalize()}** | {count} | {notification} | {timeline} |\n"
+            parts.append(f"| {emoji} **{category.capitalize()}** | {count} | {notification} | {timeline} |\n")
 
-        return table
+        return ''.join(parts)
 
     def generate_category_section(self, category: str, is_pr_comment: bool = True) -> str:
         """Generate markdown section for a specific category."""
-        emoji = self.SEVERITY_EMOJIS.get(category, '')
-        category_lower = category.lower()
-        count = self.summary.get(category_lower, 0)
-
+        # Empty categories exit on the summary count alone, before any lookups
+        count = self.summary.get(category.lower(), 0)
         if count == 0:
             return ''
 
+        emoji = self.SEVERITY_EMOJIS.get(category, '')
+
         # Get all classifications for this category
-        items = [c for c in self.classifications if c.get('category') == category]
+        items = self._model['by_category'].get(category, ())
+
+        parts = []
+        append = parts.append
 
         # Section header
         if is_pr_comment:
-            section = f"\n## {emoji} {category.capitalize()} Changes ({count})\n\n"
+            append(f"\n## {emoji} {category.capitalize()} Changes ({count})\n\n")
         else:
-            section = f"## {emoji} {category.capitalize()} Changes ({count})\n\n"
+            append(f"## {emoji} {category.capitalize()} Changes ({count})\n\n")
 
         # Add timeline info for non-routine changes
         if category == 'TRANSFORMATIVE':
-            section += "Requires **30 business days initial notice** + **10 business days final notice** + post-completion notification.\n\n"
+            append("Requires **30 business days initial notice** + **10 business days final notice** + post-completion notification.\n\n")
         elif category == 'ADAPTIVE':
-            section += "Requires notification **within 10 business days after completion**.\n\n"
+            append("Requires notification **within 10 business days after completion**.\n\n")
         elif category == 'IMPACT':
-            section += "**⚠️ New assessment required** - Cannot use SCN process for these changes.\n\n"
+            append("**⚠️ New assessment required** - Cannot use SCN process for these changes.\n\n")
 
         # Add individual changes
         if category == 'ROUTINE' and count > 10:
             # Collapse routine changes if many
             if is_pr_comment:
-                section += "<details>\n"
-                section += f"<summary>View routine changes ({count})</summary>\n\n"
+                append("<details>\n")
+                append(f"<summary>View routine changes ({count})</summary>\n\n")
 
             for i, item in enumerate(items[:10], 1):
-                section += self._format_change_item(item, i, brief=True)
+                append(self._format_change_item(item, i, brief=True))
 
             if count > 10:
-                section += f"\n*... and {count - 10} more routine changes*\n"
+                append(f"\n*... and {count - 10} more routine changes*\n")
 
             if is_pr_comment:
-                section += "\n</details>\n"
+                append("\n</details>\n")
 
         else:
             # Show all changes for non-routine or small sets
             for i, item in enumerate(items, 1):
                 if is_pr_comment and count > 3:
                     # Use collapsible for many items
-                    section += self._format_change_collapsible(item, i)
+                    append(self._format_change_collapsible(item, i))
                 else:
                     # Show directly for few items
-                    section += self._format_change_item(item, i)
+                    append(self._format_change_item(item, i))
 
-        return section
+        return ''.join(parts)
 
     def _format_change_item(self, item: Dict, index: int, brief: bool = False) -> str:
         """Format a single change item."""
@@ -172,12 +233,12 @@ class SCNReportGenerator:
         if brief:
             return f"{index}. **{resource}** - `{file_path}`\n"
 
-        item_md = f"\n### {index}. {resource}\n\n"
-        item_md += f"**File**: `{file_path}`\n"
-        item_md += f"**Classification Method**: {method.capitalize()} (confidence: {confidence*100:.0f}%)\n\n"
-        item_md += f"**Reasoning**: {reasoning}\n\n"
-
-        return item_md
+        return ''.join([
+            f"\n### {index}. {resource}\n\n",
+            f"**File**: `{file_path}`\n",
+            f"**Classification Method**: {method.capitalize()} (confidence: {confidence*100:.0f}%)\n\n",
+            f"**Reasoning**: {reasoning}\n\n",
+        ])
 
     def _format_change_collapsible(self, item: Dict, index: int) -> str:
         """Format a change item with collapsible details."""
@@ -187,90 +248,87 @@ class SCNReportGenerator:
         confidence = item.get('confidence', 0.0)
         reasoning = item.get('reasoning', 'No reasoning provided')
 
-        md = f"\n<details>\n"
-        md += f"<summary>{index}. {resource} - {file_path}</summary>\n\n"
-        md += f"**Classification Method**: {method.capitalize()} (confidence: {confidence*100:.0f}%)\n\n"
-        md += f"**Reasoning**: {reasoning}\n\n"
+        parts = [
+            "\n<details>\n",
+            f"<summary>{index}. {resource} - {file_path}</summary>\n\n",
+            f"**Classification Method**: {method.capitalize()} (confidence: {confidence*100:.0f}%)\n\n",
+            f"**Reasoning**: {reasoning}\n\n",
+        ]
 
         # Add rule info if available
         if 'rule_matched' in item:
-            md += f"**Rule Matched**: `{item['rule_matched']}`\n\n"
+            parts.append(f"**Rule Matched**: `{item['rule_matched']}`\n\n")
         elif 'ai_model' in item:
-            md += f"**AI Model**: {item['ai_model']}\n\n"
+            parts.append(f"**AI Model**: {item['ai_model']}\n\n")
 
-        md += "</details>\n"
+        parts.append("</details>\n")
 
-        return md
+        return ''.join(parts)
 
     def generate_pr_comment(self) -> str:
         """Generate markdown for PR comment."""
         highest = self.get_highest_severity()
         emoji = self.SEVERITY_EMOJIS.get(highest, '')
 
-        md = "<details>\n"
-        md += "<summary>🔐 FedRAMP Significant Change Notification (SCN) Analysis</summary>\n\n"
+        parts = []
+        append = parts.append
 
-        md += "## 📊 Change Summary\n\n"
-        md += self.generate_summary_table()
-        md += f"\n**Highest Severity**: {emoji} {highest.capitalize()}\n"
+        append(_PR_COMMENT_HEADER)
+        append(self.generate_summary_table())
+        append(f"\n**Highest Severity**: {emoji} {highest.capitalize()}\n")
 
         # Add category sections
         for category in ['IMPACT', 'TRANSFORMATIVE', 'ADAPTIVE', 'ROUTINE']:
             section = self.generate_category_section(category, is_pr_comment=True)
             if section:
-                md += f"\n---\n{section}"
+                append(f"\n---\n{section}")
 
         # Add manual review section if any
         manual_review_count = self.summary.get('manual_review', 0)
         if manual_review_count > 0:
-            md += "\n---\n"
-            md += f"\n## ⚠️ Manual Review Required ({manual_review_count})\n\n"
-            md += "The following changes could not be automatically classified. Please review manually:\n\n"
+            append("\n---\n")
+            append(f"\n## ⚠️ Manual Review Required ({manual_review_count})\n\n")
+            append("The following changes could not be automatically classified. Please review manually:\n\n")
 
-            manual_items = [c for c in self.classifications if c.get('category') == 'MANUAL_REVIEW']
+            manual_items = self._model['by_category'].get('MANUAL_REVIEW', ())
             for i, item in enumerate(manual_items, 1):
-                md += f"{i}. **{item.get('resource')}** - `{item.get('file')}`\n"
-                md += f"   Reason: {item.get('reasoning')}\n\n"
+                append(f"{i}. **{item.get('resource')}** - `{item.get('file')}`\n")
+                append(f"   Reason: {item.get('reasoning')}\n\n")
 
         # Add audit trail
-        md += "\n---\n"
-        md += self._generate_audit_section()
+        append("\n---\n")
+        append(self._generate_audit_section())
 
-        # Footer
-        md += "\n---\n\n"
-        md += "*Generated by [Argus SCN Detector](https://github.com/huntridge-labs/argus) v0.3.0*\n\n"
-        md += "</details>\n"
+        append(_PR_COMMENT_FOOTER)
 
-        return md
+        return ''.join(parts)
 
     def _generate_audit_section(self) -> str:
         """Generate audit trail section."""
-        now = datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
-
-        md = "\n## 📋 Audit Trail\n\n"
-        md += f"- **Analysis Date**: {now}\n"
+        parts = [
+            "\n## 📋 Audit Trail\n\n",
+            f"- **Analysis Date**: {self._now_iso}\n",
+        ]
 
         if self.pr_number > 0:
-            md += f"- **PR**: #{self.pr_number}\n"
+            parts.append(f"- **PR**: #{self.pr_number}\n")
 
-        md += f"- **Configuration Version**: {self.data.get('config_version', 'default')}\n"
-        md += f"- **AI Fallback Used**: {'Yes' if self.data.get('ai_enabled') else 'No'}\n"
+        parts.append(f"- **Configuration Version**: {self.data.get('config_version', 'default')}\n")
+        parts.append(f"- **AI Fallback Used**: {'Yes' if self.data.get('ai_enabled') else 'No'}\n")
 
         # Artifacts
         if self.run_id:
             artifacts_url = f"{self.server_url}/{self.repo}/actions/runs/{self.run_id}"
-            md += f"\n**Artifacts**: [View Run]({artifacts_url})\n"
+            parts.append(f"\n**Artifacts**: [View Run]({artifacts_url})\n")
 
-        return md
+        return ''.join(parts)
 
     def generate_audit_json(self) -> Dict:
         """Generate machine-readable audit trail JSON."""
-        now = datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
-
         audit = {
             'version': '1.0',
             'analysis_metadata': {
-                'timestamp': now,
+                'timestamp': self._now_iso,
                 'repository': self.repo,
                 'pull_request': self.pr_number if self.pr_number > 0 else None,
                 'run_id': self.run_id,
@@ -280,7 +338,7 @@ class SCNReportGenerator:
             'classifications': self.classifications,
             'summary': self.summary,
             'highest_severity': self.get_highest_severity(),
-            'compliance_actions': self._generate_compliance_actions()
+            'compliance_actions': self._model['compliance_actions']
         }
 
         return audit
@@ -354,13 +412,21 @@ def main():
         default='https://github.com',
         help='GitHub server URL'
     )
+    parser.add_argument(
+        '--pretty-audit',
+        action='store_true',
+        help='Indent the audit trail JSON (compact by default)'
+    )
 
     args = parser.parse_args()
 
-    # Load classifications
+    # Load classifications (orjson.JSONDecodeError subclasses json.JSONDecodeError)
     try:
-        with open(args.input, 'r', encoding='utf-8') as f:
-            classifications_data = json.load(f)
+        with open(args.input, 'rb') as f:
+            if HAS_ORJSON:
+                classifications_data = orjson.loads(f.read())
+            else:
+                classifications_data = json.load(f)
     except FileNotFoundError:
         print(f"❌ Input file not found: {args.input}", file=sys.stderr)
         return 1
@@ -392,8 +458,20 @@ def main():
     output_json_path = Path(args.output_json)
     output_json_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(output_json_path, 'w', encoding='utf-8') as f:
-        json.dump(audit_json, f, indent=2)
+    # The audit trail is machine-readable, so it is written compact unless
+    # --pretty-audit is passed
+    if HAS_ORJSON:
+        option = orjson.OPT_NON_STR_KEYS
+        if args.pretty_audit:
+            option |= orjson.OPT_INDENT_2
+        with open(output_json_path, 'wb') as f:
+            f.write(orjson.dumps(audit_json, option=option))
+    else:
+        with open(output_json_path, 'w', encoding='utf-8') as f:
+            if args.pretty_audit:
+                json.dump(audit_json, f, indent=2)
+            else:
+                json.dump(audit_json, f, separators=(',', ':'))
 
     print(f"✅ Generated audit trail: {output_json_path}")
 
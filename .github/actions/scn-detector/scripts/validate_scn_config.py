@@ -21,10 +21,55 @@ from typing import Dict, List
 
 import yaml
 
-
-VALID_CATEGORIES = {'routine', 'adaptive', 'transformative', 'impact'}
-VALID_IMPACT_LEVELS = {'Low', 'Moderate', 'High'}
-VALID_AI_PROVIDERS = {'anthropic', 'openai'}
+# Prefer the libyaml C parser; fall back to the pure-Python loader
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+VALID_CATEGORIES = frozenset({'routine', 'adaptive', 'transformative', 'impact'})
+VALID_IMPACT_LEVELS = frozenset({'Low', 'Moderate', 'High'})
+VALID_AI_PROVIDERS = frozenset({'anthropic', 'openai'})
+
+# Sorted listings for error messages, built once
+_VALID_CATEGORIES_STR = ', '.join(sorted(VALID_CATEGORIES))
+_VALID_IMPACT_LEVELS_STR = ', '.join(sorted(VALID_IMPACT_LEVELS))
+_VALID_AI_PROVIDERS_STR = ', '.join(sorted(VALID_AI_PROVIDERS))
+
+# Sentinel for single-lookup presence checks (distinguishes absent from null)
+_MISSING = object()
+
+# Declarative field type tables: (field, expected type, description)
+_TOP_STRING_FIELDS = ('name', 'description', 'compliance_framework')
+_RULE_CRITERION_FIELDS = frozenset({'pattern', 'resource', 'attribute'})
+_RULE_STRING_FIELDS = ('pattern', 'resource', 'attribute', 'operation')
+_NUMBER_TYPES = (int, float)
+_AI_POSITIVE_INT_FIELDS = ('max_tokens', 'max_diff_chars')
+_AI_STRING_FIELDS = ('api_base_url', 'system_prompt', 'user_prompt_template')
+_NOTIFICATION_FIELDS = {
+    'adaptive': (
+        ('post_completion_days', int, 'an integer'),
+        ('description', str, 'a string'),
+    ),
+    'transformative': (
+        ('initial_notice_days', int, 'an integer'),
+        ('final_notice_days', int, 'an integer'),
+        ('post_completion_required', bool, 'a boolean'),
+        ('description', str, 'a string'),
+    ),
+    'impact': (
+        ('requires_new_assessment', bool, 'a boolean'),
+        ('description', str, 'a string'),
+    ),
+}
+_NOTIFICATION_KEYS_STR = ', '.join(sorted(_NOTIFICATION_FIELDS))
 
 
 def _validate_rules(rules, errors: List[str]) -> None:
@@ -39,7 +84,7 @@ def _validate_rules(rules, errors: List[str]) -> None:
 
     for key in rules:
         if key not in VALID_CATEGORIES:
-            errors.append(f'rules: unknown category "{key}" (valid: {", ".join(sorted(VALID_CATEGORIES))})')
+            errors.append(f'rules: unknown category "{key}" (valid: {_VALID_CATEGORIES_STR})')
 
     for category in VALID_CATEGORIES:
         if category not in rules:
@@ -64,17 +109,18 @@ def _validate_rule(rule, path: str, errors: List[str]) -> None:
         errors.append(f'{path}: must be an object')
         return
 
-    if 'description' not in rule:
+    description = rule.get('description', _MISSING)
+    if description is _MISSING:
         errors.append(f'{path}.description: required field missing')
-    elif not isinstance(rule['description'], str):
+    elif not isinstance(description, str):
         errors.append(f'{path}.description: must be a string')
 
-    has_criterion = any(key in rule for key in ('pattern', 'resource', 'attribute'))
-    if not has_criterion:
+    if rule.keys().isdisjoint(_RULE_CRITERION_FIELDS):
         errors.append(f'{path}: must have at least one of pattern, resource, or attribute')
 
-    for field in ('pattern', 'resource', 'attribute', 'operation'):
-        if field in rule and not isinstance(rule[field], str):
+    for field in _RULE_STRING_FIELDS:
+        value = rule.get(field, _MISSING)
+        if value is not _MISSING and not isinstance(value, str):
             errors.append(f'{path}.{field}: must be a string')
 
 
@@ -84,41 +130,39 @@ def _validate_ai_fields(config: Dict, prefix: str, errors: List[str]) -> None:
         errors.append(f'{prefix}: must be a mapping')
         return
 
-    if 'provider' in config:
-        if not isinstance(config['provider'], str):
+    provider = config.get('provider', _MISSING)
+    if provider is not _MISSING:
+        if not isinstance(provider, str):
             errors.append(f'{prefix}.provider: must be a string')
-        elif config['provider'] not in VALID_AI_PROVIDERS:
+        elif provider not in VALID_AI_PROVIDERS:
             errors.append(
-                f'{prefix}.provider: "{config["provider"]}" is not valid '
-                f'(valid: {", ".join(sorted(VALID_AI_PROVIDERS))})'
+                f'{prefix}.provider: "{provider}" is not valid '
+                f'(valid: {_VALID_AI_PROVIDERS_STR})'
             )
 
-    if 'model' in config and not isinstance(config['model'], str):
+    model = config.get('model', _MISSING)
+    if model is not _MISSING and not isinstance(model, str):
         errors.append(f'{prefix}.model: must be a string')
 
-    if 'confidence_threshold' in config:
-        ct = config['confidence_threshold']
-        if not isinstance(ct, (int, float)):
+    ct = config.get('confidence_threshold', _MISSING)
+    if ct is not _MISSING:
+        if not isinstance(ct, _NUMBER_TYPES):
             errors.append(f'{prefix}.confidence_threshold: must be a number')
         elif ct < 0.0 or ct > 1.0:
             errors.append(f'{prefix}.confidence_threshold: must be between 0.0 and 1.0')
 
-    if 'max_tokens' in config:
-        mt = config['max_tokens']
-        if not isinstance(mt, int):
-            errors.append(f'{prefix}.max_tokens: must be an integer')
-        elif mt < 1:
-            errors.append(f'{prefix}.max_tokens: must be >= 1')
-
-    if 'max_diff_chars' in config:
-        mdc = config['max_diff_chars']
-        if not isinstance(mdc, int):
-            errors.append(f'{prefix}.max_diff_chars: must be an integer')
-        elif mdc < 1:
-            errors.append(f'{prefix}.max_diff_chars: must be >= 1')
-
-    for field in ('api_base_url', 'system_prompt', 'user_prompt_template'):
-        if field in config and not isinstance(config[field], str):
+    for field in _AI_POSITIVE_INT_FIELDS:
+        value = config.get(field, _MISSING)
+        if value is _MISSING:
+            continue
+        if not isinstance(value, int):
+            errors.append(f'{prefix}.{field}: must be an integer')
+        elif value < 1:
+            errors.append(f'{prefix}.{field}: must be >= 1')
+
+    for field in _AI_STRING_FIELDS:
+        value = config.get(field, _MISSING)
+        if value is not _MISSING and not isinstance(value, str):
             errors.append(f'{prefix}.{field}: must be a string')
 
 
@@ -128,43 +172,21 @@ def _validate_notifications(notifications, errors: List[str]) -> None:
         errors.append('notifications: must be a mapping')
         return
 
-    valid_keys = {'adaptive', 'transformative', 'impact'}
     for key in notifications:
-        if key not in valid_keys:
-            errors.append(f'notifications: unknown key "{key}" (valid: {", ".join(sorted(valid_keys))})')
-
-    if 'adaptive' in notifications:
-        adaptive = notifications['adaptive']
-        if isinstance(adaptive, dict):
-            if 'post_completion_days' in adaptive and not isinstance(adaptive['post_completion_days'], int):
-                errors.append('notifications.adaptive.post_completion_days: must be an integer')
-            if 'description' in adaptive and not isinstance(adaptive['description'], str):
-                errors.append('notifications.adaptive.description: must be a string')
-        elif adaptive is not None:
-            errors.append('notifications.adaptive: must be a mapping')
-
-    if 'transformative' in notifications:
-        transformative = notifications['transformative']
-        if isinstance(transformative, dict):
-            for field in ('initial_notice_days', 'final_notice_days'):
-                if field in transformative and not isinstance(transformative[field], int):
-                    errors.append(f'notifications.transformative.{field}: must be an integer')
-            if 'post_completion_required' in transformative and not isinstance(transformative['post_completion_required'], bool):
-                errors.append('notifications.transformative.post_completion_required: must be a boolean')
-            if 'description' in transformative and not isinstance(transformative['description'], str):
-                errors.append('notifications.transformative.description: must be a string')
-        elif transformative is not None:
-            errors.append('notifications.transformative: must be a mapping')
-
-    if 'impact' in notifications:
-        impact = notifications['impact']
-        if isinstance(impact, dict):
-            if 'requires_new_assessment' in impact and not isinstance(impact['requires_new_assessment'], bool):
-                errors.append('notifications.impact.requires_new_assessment: must be a boolean')
-            if 'description' in impact and not isinstance(impact['description'], str):
-                errors.append('notifications.impact.description: must be a string')
-        elif impact is not None:
-            errors.append('notifications.impact: must be a mapping')
+        if key not in _NOTIFICATION_FIELDS:
+            errors.append(f'notifications: unknown key "{key}" (valid: {_NOTIFICATION_KEYS_STR})')
+
+    for key, fields in _NOTIFICATION_FIELDS.items():
+        section = notifications.get(key)
+        if section is None:
+            continue
+        if not isinstance(section, dict):
+            errors.append(f'notifications.{key}: must be a mapping')
+            continue
+        for field, expected_type, type_name in fields:
+            value = section.get(field, _MISSING)
+            if value is not _MISSING and not isinstance(value, expected_type):
+                errors.append(f'notifications.{key}.{field}: must be {type_name}')
 
 
 def _validate_issue_templates(templates, errors: List[str]) -> None:
@@ -173,13 +195,14 @@ def _validate_issue_templates(templates, errors: List[str]) -> None:
         errors.append('issue_templates: must be a mapping')
         return
 
-    if 'labels' in templates:
-        labels = templates['labels']
+    labels = templates.get('labels', _MISSING)
+    if labels is not _MISSING:
         if isinstance(labels, dict):
-            if 'prefix' in labels and not isinstance(labels['prefix'], str):
+            prefix = labels.get('prefix', _MISSING)
+            if prefix is not _MISSING and not isinstance(prefix, str):
                 errors.append('issue_templates.labels.prefix: must be a string')
-            if 'categories' in labels:
-                cats = labels['categories']
+            cats = labels.get('categories', _MISSING)
+            if cats is not _MISSING:
                 if isinstance(cats, dict):
                     for key, val in cats.items():
                         if not isinstance(val, str):
@@ -189,8 +212,8 @@ def _validate_issue_templates(templates, errors: List[str]) -> None:
         else:
             errors.append('issue_templates.labels: must be a mapping')
 
-    if 'checklist' in templates:
-        checklist = templates['checklist']
+    checklist = templates.get('checklist', _MISSING)
+    if checklist is not _MISSING:
         if isinstance(checklist, dict):
             for key, val in checklist.items():
                 if not isinstance(val, list):
@@ -230,8 +253,9 @@ def validate_config_structure(config: dict, schema: dict) -> None:
         _validate_rules(config['rules'], errors)
 
     # Optional typed fields
-    for field in ('name', 'description', 'compliance_framework'):
-        if field in config and not isinstance(config[field], str):
+    for field in _TOP_STRING_FIELDS:
+        value = config.get(field, _MISSING)
+        if value is not _MISSING and not isinstance(value, str):
             errors.append(f'{field}: must be a string')
 
     if 'impact_level' in config:
@@ -240,7 +264,7 @@ def validate_config_structure(config: dict, schema: dict) -> None:
         elif config['impact_level'] not in VALID_IMPACT_LEVELS:
             errors.append(
                 f'impact_level: "{config["impact_level"]}" is not valid '
-                f'(valid: {", ".join(sorted(VALID_IMPACT_LEVELS))})'
+                f'(valid: {_VALID_IMPACT_LEVELS_STR})'
             )
 
     # Optional sections
@@ -284,13 +308,14 @@ def load_config(file_path: str) -> dict:
     path = Path(file_path)
     ext = path.suffix.lower()
 
-    with open(path, 'r', encoding='utf-8') as f:
+    # Both parsers accept raw bytes, so skip the intermediate str decode
+    with open(path, 'rb') as f:
         content = f.read()
 
     if ext in ('.yml', '.yaml'):
-        return yaml.safe_load(content) or {}
+        return yaml.load(content, Loader=_SafeLoader) or {}
     elif ext == '.json':
-        return json.loads(content)
+        return orjson.loads(content) if HAS_ORJSON else json.loads(content)
     else:
         raise ValueError(f'Unsupported config file type: {ext}. Use .yml, .yaml, or .json')
 
@@ -314,8 +339,8 @@ def main():
         config = load_config(config_file)
 
         print(f'Loading schema from: {schema_file}')
-        with open(schema_file, 'r', encoding='utf-8') as f:
-            schema = json.load(f)
+        with open(schema_file, 'rb') as f:
+            schema = orjson.loads(f.read()) if HAS_ORJSON else json.load(f)
 
         print('Validating SCN config against schema...')
         validate_config_structure(config, schema)
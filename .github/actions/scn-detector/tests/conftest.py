@@ -0,0 +1,147 @@
+"""
+Shared fixtures for scn-detector tests.
+"""
+
+import socket
+import sys
+from pathlib import Path
+
+import pytest
+
+# Resolved once here; test modules take these through the fixtures below
+ACTION_DIR = Path(__file__).resolve().parent.parent
+SCRIPTS_DIR = ACTION_DIR / "scripts"
+REPO_ROOT = ACTION_DIR.parents[2]
+FIXTURES_DIR = REPO_ROOT / "tests" / "fixtures" / "scn-detector"
+
+# Put scripts/ on sys.path once so test modules import scripts directly
+# ("import classify_changes") and their sibling imports resolve
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+import ai_classifier
+import ai_providers
+import classify_changes
+import generate_scn_report
+import validate_scn_config
+
+
+class _StubProvider:
+    """Minimal AI provider stand-in that returns a canned response or raises."""
+
+    def __init__(self, response=None, exc=None):
+        self._response = response
+        self._exc = exc
+        self.calls = []
+
+    def call(self, prompt):
+        self.calls.append(prompt)
+        if self._exc is not None:
+            raise self._exc
+        return self._response
+
+
+class _CannedResponse:
+    """requests.Response stand-in serving a fixed JSON body."""
+
+    def __init__(self, payload):
+        self._payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._payload
+
+
+class _FakePost:
+    """requests.post replacement that records calls and replays one outcome."""
+
+    def __init__(self):
+        self.payload = None
+        self.exc = None
+        self.calls = []
+
+    def __call__(self, url, **kwargs):
+        self.calls.append((url, kwargs))
+        if self.exc is not None:
+            raise self.exc
+        return _CannedResponse(self.payload)
+
+
+@pytest.fixture(params=[True, False], ids=['orjson', 'json'])
+def has_orjson(request, monkeypatch):
+    """Run the test once with orjson and once with the json stdlib fallback."""
+    if request.param:
+        pytest.importorskip('orjson')
+    for module in (classify_changes, generate_scn_report, validate_scn_config):
+        monkeypatch.setattr(module, 'HAS_ORJSON', request.param)
+    return request.param
+
+
+def _network_guard(*args, **kwargs):
+    raise RuntimeError("Network access attempted during scn-detector tests")
+
+
+@pytest.fixture(autouse=True)
+def _block_network(monkeypatch):
+    """Fail fast instead of hanging if a test reaches a real socket."""
+    monkeypatch.setattr(socket.socket, 'connect', _network_guard)
+    monkeypatch.setattr(socket.socket, 'connect_ex', _network_guard)
+
+
+@pytest.fixture(scope="session")
+def repo_root():
+    """The repository root."""
+    return REPO_ROOT
+
+
+@pytest.fixture(scope="session")
+def fixtures_dir():
+    """tests/fixtures/scn-detector at the repository root."""
+    return FIXTURES_DIR
+
+
+@pytest.fixture(scope="session")
+def profiles_dir():
+    """The built-in scn-detector profiles."""
+    return ACTION_DIR / "profiles"
+
+
+@pytest.fixture(scope="session")
+def schema_path():
+    """The SCN config JSON schema."""
+    return ACTION_DIR / "schemas" / "scn-config.schema.json"
+
+
+@pytest.fixture(scope="session")
+def default_classifier():
+    """Shared AIClassifier with default config, for tests that do not mutate it."""
+    return ai_classifier.AIClassifier(api_key='test-key')
+
+
+@pytest.fixture
+def stub_provider():
+    """Factory for stub providers: stub_provider(response=...) or stub_provider(exc=...)."""
+    return _StubProvider
+
+
+@pytest.fixture
+def no_anthropic_sdk(monkeypatch):
+    """Force AnthropicProvider onto its raw HTTP path."""
+    monkeypatch.setattr(ai_providers, 'HAS_ANTHROPIC_SDK', False)
+    return ai_providers
+
+
+@pytest.fixture(scope="session")
+def fake_response():
+    """Factory for response stand-ins: fake_response(json_body)."""
+    return _CannedResponse
+
+
+@pytest.fixture
+def fake_post(monkeypatch):
+    """Route requests.post to a _FakePost; set .payload or .exc before calling."""
+    fake = _FakePost()
+    monkeypatch.setattr('requests.post', fake)
+    return fake
@@ -3,53 +3,71 @@
 Tests for AI classification module.
 """
 
-import importlib.util
 import json
 import pytest
-import sys
-from pathlib import Path
-from unittest.mock import patch, MagicMock
 
-# Import module dynamically
-REPO_ROOT = Path(__file__).resolve().parents[4]
-SCRIPTS_DIR = REPO_ROOT / ".github" / "actions" / "scn-detector" / "scripts"
-
-if str(SCRIPTS_DIR) not in sys.path:
-    sys.path.insert(0, str(SCRIPTS_DIR))
-
-spec = importlib.util.spec_from_file_location(
-    "ai_classifier",
-    SCRIPTS_DIR / "ai_classifier.py"
-)
-ai_classifier = importlib.util.module_from_spec(spec)
-sys.modules["ai_classifier"] = ai_classifier
-spec.loader.exec_module(ai_classifier)
+import ai_classifier
+import ai_providers
 
 
 pytestmark = pytest.mark.unit
 
+# Fixed provider responses and change input shared by the classify tests.
+# classify() never mutates the change dict, so one instance is reused.
+_ADAPTIVE_OK = json.dumps({
+    'category': 'ADAPTIVE',
+    'confidence': 0.92,
+    'reasoning': 'Instance type change'
+})
+_LOW_CONF = json.dumps({
+    'category': 'ADAPTIVE',
+    'confidence': 0.5,
+    'reasoning': 'Uncertain'
+})
+_MALFORMED = json.dumps({
+    'category': 'ADAPTIVE',
+    'confidence': 'not-a-number',
+    'reasoning': 'test'
+})
+_HTTP_ADAPTIVE = json.dumps({
+    'category': 'adaptive',
+    'confidence': 0.95,
+    'reasoning': 'Scaling change'
+})
+_MODIFY_CHANGE = {'type': 'test', 'name': 'test', 'operation': 'modify'}
+_LONG_DIFF_CHANGE = {
+    'type': 'test',
+    'name': 'test',
+    'operation': 'modify',
+    'attributes_changed': [],
+    'diff': 'x' * 5000
+}
+
 
 class TestAIClassifierInit:
     """Test AIClassifier initialization."""
 
-    @patch.dict('os.environ', {}, clear=True)
+    @pytest.fixture(autouse=True)
+    def _clear_provider_keys(self, monkeypatch):
+        """Keep results independent of the developer's environment."""
+        monkeypatch.delenv('ANTHROPIC_API_KEY', raising=False)
+        monkeypatch.delenv('OPENAI_API_KEY', raising=False)
+
     def test_init_no_api_key(self):
         """Initializes without API key."""
         classifier = ai_classifier.AIClassifier(api_key=None)
         assert classifier.api_key is None
         assert classifier.provider is None
 
-    def test_init_with_api_key(self):
+    def test_init_with_api_key(self, default_classifier):
         """Initializes with provided API key."""
-        classifier = ai_classifier.AIClassifier(api_key='test-key')
-        assert classifier.api_key == 'test-key'
+        assert default_classifier.api_key == 'test-key'
 
-    def test_init_default_config(self):
+    def test_init_default_config(self, default_classifier):
         """Uses default config when none provided."""
-        classifier = ai_classifier.AIClassifier(api_key='test-key')
-        assert classifier.ai_config['model'] == 'claude-3-haiku-20240307'
-        assert classifier.ai_config['confidence_threshold'] == 0.8
-        assert classifier.ai_config['provider'] == 'anthropic'
+        assert default_classifier.ai_config['model'] == 'claude-3-haiku-20240307'
+        assert default_classifier.ai_config['confidence_threshold'] == 0.8
+        assert default_classifier.ai_config['provider'] == 'anthropic'
 
     def test_init_custom_config(self):
         """Uses provided config."""
@@ -59,23 +77,22 @@ class TestAIClassifierInit:
         assert classifier.ai_config['model'] == 'gpt-4o-mini'
         assert classifier.ai_config['confidence_threshold'] == 0.9
 
-    @patch.dict('os.environ', {'ANTHROPIC_API_KEY': 'env-key'})
-    def test_init_api_key_from_env(self):
+    def test_init_api_key_from_env(self, monkeypatch):
         """Falls back to env var for API key (anthropic provider)."""
+        monkeypatch.setenv('ANTHROPIC_API_KEY', 'env-key')
         classifier = ai_classifier.AIClassifier()
         assert classifier.api_key == 'env-key'
 
-    @patch.dict('os.environ', {'OPENAI_API_KEY': 'openai-env-key'})
-    def test_init_openai_api_key_from_env(self):
+    def test_init_openai_api_key_from_env(self, monkeypatch):
         """Falls back to OPENAI_API_KEY for openai provider."""
+        monkeypatch.setenv('OPENAI_API_KEY', 'openai-env-key')
         config = {'provider': 'openai', 'model': 'gpt-4o-mini', 'confidence_threshold': 0.8}
         classifier = ai_classifier.AIClassifier(ai_config=config)
         assert classifier.api_key == 'openai-env-key'
 
-    def test_init_creates_provider_instance(self):
+    def test_init_creates_provider_instance(self, default_classifier):
         """Provider instance is created when API key is available."""
-        classifier = ai_classifier.AIClassifier(api_key='test-key')
-        assert classifier.provider is not None
+        assert isinstance(default_classifier.provider, ai_providers.AnthropicProvider)
 
     def test_init_unknown_provider_no_crash(self):
         """Unknown provider doesn't crash, provider is None."""
@@ -87,35 +104,21 @@ class TestAIClassifierInit:
 class TestAIClassifierClassify:
     """Test AIClassifier.classify method."""
 
-    def test_classify_no_api_key(self):
+    def test_classify_no_api_key(self, monkeypatch):
         """Returns MANUAL_REVIEW when no API key."""
+        monkeypatch.delenv('ANTHROPIC_API_KEY', raising=False)
         classifier = ai_classifier.AIClassifier(api_key=None)
-        change = {'type': 'test', 'name': 'test', 'operation': 'modify'}
-
-        result = classifier.classify(change)
+        result = classifier.classify(_MODIFY_CHANGE)
 
         assert result['category'] == 'MANUAL_REVIEW'
         assert result['confidence'] == 0.0
         assert 'not available' in result['reasoning']
 
-    def test_classify_no_provider(self):
-        """Returns MANUAL_REVIEW when provider is None."""
-        classifier = ai_classifier.AIClassifier(api_key='test-key')
-        classifier.provider = None
-
-        result = classifier.classify({'type': 'test', 'name': 'test', 'operation': 'modify'})
-        assert result['category'] == 'MANUAL_REVIEW'
-
-    def test_classify_success(self):
+    def test_classify_success(self, stub_provider):
         """Successful classification via provider."""
         classifier = ai_classifier.AIClassifier(api_key='test-key')
-        mock_provider = MagicMock()
-        mock_provider.call.return_value = json.dumps({
-            'category': 'ADAPTIVE',
-            'confidence': 0.92,
-            'reasoning': 'Instance type change'
-        })
-        classifier.provider = mock_provider
+        provider = stub_provider(response=_ADAPTIVE_OK)
+        classifier.provider = provider
 
         change = {
             'type': 'aws_instance',
@@ -129,73 +132,54 @@ class TestAIClassifierClassify:
 
         assert result['category'] == 'ADAPTIVE'
         assert result['confidence'] == 0.92
-        mock_provider.call.assert_called_once()
+        assert len(provider.calls) == 1
 
-    def test_classify_low_confidence(self):
+    def test_classify_low_confidence(self, stub_provider):
         """Low confidence returns MANUAL_REVIEW."""
         classifier = ai_classifier.AIClassifier(api_key='test-key')
-        mock_provider = MagicMock()
-        mock_provider.call.return_value = json.dumps({
-            'category': 'ADAPTIVE',
-            'confidence': 0.5,
-            'reasoning': 'Uncertain'
-        })
-        classifier.provider = mock_provider
+        classifier.provider = stub_provider(response=_LOW_CONF)
 
-        result = classifier.classify({'type': 'test', 'name': 'test', 'operation': 'modify'})
+        result = classifier.classify(_MODIFY_CHANGE)
 
         assert result['category'] == 'MANUAL_REVIEW'
         assert result['confidence'] == 0.5
         assert 'Low confidence' in result['reasoning']
 
-    def test_classify_provider_network_error_fallback(self):
-        """Network errors fall back to MANUAL_REVIEW."""
-        classifier = ai_classifier.AIClassifier(api_key='test-key')
-        mock_provider = MagicMock()
-        mock_provider.call.side_effect = ConnectionError("Connection timeout")
-        classifier.provider = mock_provider
+    @pytest.mark.parametrize('provider_kwargs, expected_reason', [
+        (None, 'not available'),
+        ({'exc': ConnectionError("Connection timeout")}, 'AI API error'),
+        ({'response': "not valid json {{"}, 'invalid JSON'),
+        ({'response': _MALFORMED}, 'parse error'),
+    ], ids=['no-provider', 'network-error', 'invalid-json', 'malformed-response'])
+    def test_classify_fallback(self, monkeypatch, default_classifier, stub_provider,
+                               provider_kwargs, expected_reason):
+        """Missing provider and provider failures fall back to MANUAL_REVIEW."""
+        provider = stub_provider(**provider_kwargs) if provider_kwargs is not None else None
+        monkeypatch.setattr(default_classifier, 'provider', provider)
 
-        result = classifier.classify({'type': 'test', 'name': 'test', 'operation': 'modify'})
+        result = default_classifier.classify(_MODIFY_CHANGE)
 
         assert result['category'] == 'MANUAL_REVIEW'
-        assert 'AI API error' in result['reasoning']
-
-    def test_classify_provider_invalid_json_fallback(self):
-        """Invalid JSON response falls back to MANUAL_REVIEW."""
-        classifier = ai_classifier.AIClassifier(api_key='test-key')
-        mock_provider = MagicMock()
-        mock_provider.call.return_value = "not valid json {{"
-        classifier.provider = mock_provider
-
-        result = classifier.classify({'type': 'test', 'name': 'test', 'operation': 'modify'})
-
-        assert result['category'] == 'MANUAL_REVIEW'
-        assert 'invalid JSON' in result['reasoning']
-
-    def test_classify_provider_malformed_response_fallback(self):
-        """Malformed response data falls back to MANUAL_REVIEW."""
-        import json as _json
-        classifier = ai_classifier.AIClassifier(api_key='test-key')
-        mock_provider = MagicMock()
-        mock_provider.call.return_value = _json.dumps({
-            'category': 'ADAPTIVE',
-            'confidence': 'not-a-number',
-            'reasoning': 'test'
-        })
-        classifier.provider = mock_provider
+        assert result['confidence'] == 0.0
+        assert expected_reason in result['reasoning']
 
-        result = classifier.classify({'type': 'test', 'name': 'test', 'operation': 'modify'})
 
-        assert result['category'] == 'MANUAL_REVIEW'
-        assert 'parse error' in result['reasoning']
+@pytest.fixture(scope='class', params=[
+    pytest.param((50, 50), id='limit-50'),
+    pytest.param(('invalid', 1000), id='invalid-falls-back-to-1000'),
+])
+def truncation_classifier(request):
+    """Classifier built with a given max_diff_chars, plus the expected limit."""
+    max_diff_chars, expected_limit = request.param
+    config = {'max_diff_chars': max_diff_chars, 'model': 'test', 'confidence_threshold': 0.8, 'provider': 'anthropic'}
+    return ai_classifier.AIClassifier(ai_config=config, api_key='test-key'), expected_limit
 
 
 class TestBuildPrompt:
     """Test AIClassifier._build_prompt method."""
 
-    def test_prompt_contains_change_details(self):
+    def test_prompt_contains_change_details(self, default_classifier):
         """Prompt includes resource type, name, operation."""
-        classifier = ai_classifier.AIClassifier(api_key='test-key')
         change = {
             'type': 'aws_instance',
             'name': 'web_server',
@@ -204,7 +188,7 @@ class TestBuildPrompt:
             'diff': '- t2.micro\n+ t3.small'
         }
 
-        prompt = classifier._build_prompt(change)
+        prompt = default_classifier._build_prompt(change)
 
         assert 'aws_instance' in prompt
         assert 'web_server' in prompt
@@ -212,46 +196,53 @@ class TestBuildPrompt:
         assert 'instance_type' in prompt
         assert 'FedRAMP' in prompt
 
-    def test_prompt_handles_missing_fields(self):
+    def test_prompt_handles_missing_fields(self, default_classifier):
         """Prompt handles change with missing fields gracefully."""
-        classifier = ai_classifier.AIClassifier(api_key='test-key')
         change = {}
 
-        prompt = classifier._build_prompt(change)
+        prompt = default_classifier._build_prompt(change)
 
         assert 'unknown' in prompt
         assert 'FedRAMP' in prompt
 
-    def test_prompt_truncates_long_diff(self):
-        """Diff truncated to max_diff_chars."""
-        config = {'max_diff_chars': 50, 'model': 'test', 'confidence_threshold': 0.8, 'provider': 'anthropic'}
-        classifier = ai_classifier.AIClassifier(ai_config=config, api_key='test-key')
-        change = {
-            'type': 'test',
-            'name': 'test',
-            'operation': 'modify',
-            'attributes_changed': [],
-            'diff': 'x' * 5000
-        }
+    def test_prompt_truncates_long_diff(self, truncation_classifier):
+        """Diff truncated to max_diff_chars, or 1000 when the setting is invalid."""
+        classifier, expected_limit = truncation_classifier
 
-        prompt = classifier._build_prompt(change)
+        prompt = classifier._build_prompt(_LONG_DIFF_CHANGE)
 
-        # The full 5000-char diff should NOT appear in the prompt
-        assert 'x' * 5000 not in prompt
+        assert 'x' * expected_limit in prompt
+        assert 'x' * (expected_limit + 1) not in prompt
 
-    def test_prompt_invalid_max_diff_chars(self):
-        """Invalid max_diff_chars falls back to 1000."""
-        config = {'max_diff_chars': 'invalid', 'model': 'test', 'confidence_threshold': 0.8, 'provider': 'anthropic'}
-        classifier = ai_classifier.AIClassifier(ai_config=config, api_key='test-key')
-        change = {
-            'type': 'test',
-            'name': 'test',
-            'operation': 'modify',
-            'attributes_changed': [],
-            'diff': 'y' * 2000
-        }
 
-        prompt = classifier._build_prompt(change)
+class TestClassifyThroughProvider:
+    """Test AIClassifier.classify against a real provider with HTTP patched."""
+
+    def _http_classifier(self):
+        classifier = ai_classifier.AIClassifier(api_key='test-key')
+        # Force the raw HTTP path regardless of whether the SDK is installed
+        classifier.provider.client = None
+        return classifier
+
+    def test_classify_via_http_provider(self, fake_post):
+        """Provider HTTP response flows through to the classification."""
+        classifier = self._http_classifier()
+        fake_post.payload = {'content': [{'text': _HTTP_ADAPTIVE}]}
+
+        result = classifier.classify(_MODIFY_CHANGE)
 
-        # Falls back to 1000 char truncation
-        assert 'y' * 2000 not in prompt
+        assert result == {'category': 'ADAPTIVE', 'confidence': 0.95, 'reasoning': 'Scaling change'}
+        url, kwargs = fake_post.calls[-1]
+        assert url == 'https://api.anthropic.com/v1/messages'
+        assert kwargs['timeout'] == 30
+        assert kwargs['headers']['x-api-key'] == 'test-key'
+
+    def test_classify_http_error_fallback(self, fake_post):
+        """HTTP errors raised by the provider fall back to MANUAL_REVIEW."""
+        classifier = self._http_classifier()
+        fake_post.exc = ai_classifier.requests.RequestException('boom')
+
+        result = classifier.classify(_MODIFY_CHANGE)
+
+        assert result['category'] == 'MANUAL_REVIEW'
+        assert 'AI API error' in result['reasoning']
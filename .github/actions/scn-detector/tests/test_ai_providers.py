@@ -3,278 +3,129 @@
 Tests for AI provider abstraction module.
 """
 
-import importlib.util
-import json
 import pytest
-import sys
-from pathlib import Path
-from unittest.mock import patch, MagicMock
-
-# Import module dynamically
-REPO_ROOT = Path(__file__).resolve().parents[4]
-SCRIPTS_DIR = REPO_ROOT / ".github" / "actions" / "scn-detector" / "scripts"
-
-if str(SCRIPTS_DIR) not in sys.path:
-    sys.path.insert(0, str(SCRIPTS_DIR))
-
-spec = importlib.util.spec_from_file_location(
-    "ai_providers",
-    SCRIPTS_DIR / "ai_providers.py"
-)
-ai_providers = importlib.util.module_from_spec(spec)
-sys.modules["ai_providers"] = ai_providers
-spec.loader.exec_module(ai_providers)
-
-# Import defaults module
-defaults_spec = importlib.util.spec_from_file_location(
-    "defaults",
-    SCRIPTS_DIR / "defaults.py"
-)
-defaults = importlib.util.module_from_spec(defaults_spec)
-sys.modules["defaults"] = defaults
-defaults_spec.loader.exec_module(defaults)
 
-
-pytestmark = pytest.mark.unit
+import ai_providers
+import defaults
 
 
-class TestAnthropicProvider:
-    """Test AnthropicProvider class."""
-
-    def test_env_var(self):
-        """Correct env var for Anthropic."""
-        assert ai_providers.AnthropicProvider.ENV_VAR == 'ANTHROPIC_API_KEY'
+pytestmark = pytest.mark.unit
 
-    def test_default_base_url(self):
-        """Default base URL for Anthropic comes from defaults module."""
-        provider = ai_providers.AnthropicProvider('test-key', {
-            'model': 'claude-3-haiku-20240307',
-            'max_tokens': 1024
-        })
-        assert provider.base_url == defaults.DEFAULT_API_BASE_URLS['anthropic']
-        assert provider.base_url == 'https://api.anthropic.com'
 
-    @patch('ai_providers.HAS_ANTHROPIC_SDK', False)
-    def test_init_without_sdk(self):
+# Per-provider expectations for the shared provider tests below
+_PROVIDER_SPECS = [
+    pytest.param({
+        'name': 'anthropic',
+        'class_name': 'AnthropicProvider',
+        'env_var': 'ANTHROPIC_API_KEY',
+        'model': 'claude-3-haiku-20240307',
+        'base_url': 'https://api.anthropic.com',
+        'endpoint': '/v1/messages',
+        'custom_base_url': 'https://custom.api.com',
+        'response': lambda text: {'content': [{'text': text}]},
+        'auth_headers': lambda key: {'x-api-key': key, 'anthropic-version': '2023-06-01'},
+    }, id='anthropic'),
+    pytest.param({
+        'name': 'openai',
+        'class_name': 'OpenAIProvider',
+        'env_var': 'OPENAI_API_KEY',
+        'model': 'gpt-4o-mini',
+        'base_url': 'https://api.openai.com/v1',
+        'endpoint': '/chat/completions',
+        'custom_base_url': 'http://localhost:11434/v1',
+        'response': lambda text: {'choices': [{'message': {'content': text}}]},
+        'auth_headers': lambda key: {'Authorization': f'Bearer {key}'},
+    }, id='openai'),
+]
+
+
+@pytest.fixture(scope='class', params=_PROVIDER_SPECS)
+def spec(request):
+    """Provider expectations plus the resolved provider class."""
+    return dict(request.param, cls=getattr(ai_providers, request.param['class_name']))
+
+
+def _make_provider(spec, api_key='test-key', **config):
+    """Construct the spec's provider on its raw HTTP path (no SDK client)."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(ai_providers, 'HAS_ANTHROPIC_SDK', False)
+        mp.setattr(ai_providers, 'HAS_OPENAI_SDK', False)
+        return spec['cls'](api_key, {'model': spec['model'], 'max_tokens': 1024, **config})
+
+
+@pytest.fixture(scope='class')
+def provider(spec):
+    """Default-config provider shared by the tests of one class and spec."""
+    return _make_provider(spec)
+
+
+class TestProviders:
+    """Test AnthropicProvider and OpenAIProvider against the same expectations."""
+
+    def test_env_var(self, spec):
+        """Correct env var for the provider."""
+        assert spec['cls'].ENV_VAR == spec['env_var']
+
+    def test_default_base_url(self, spec, provider):
+        """Default base URL comes from defaults module."""
+        assert provider.base_url == defaults.DEFAULT_API_BASE_URLS[spec['name']]
+        assert provider.base_url == spec['base_url']
+
+    def test_init_without_sdk(self, provider):
         """Initializes without SDK (client is None)."""
-        provider = ai_providers.AnthropicProvider('test-key', {'model': 'claude-3-haiku-20240307', 'max_tokens': 1024})
         assert provider.client is None
         assert provider.api_key == 'test-key'
 
-    @patch('ai_providers.HAS_ANTHROPIC_SDK', False)
-    @patch('ai_providers.requests.post')
-    def test_http_call_success(self, mock_post):
-        """Raw HTTP call returns response text."""
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            'content': [{'text': '{"category": "ADAPTIVE"}'}]
-        }
-        mock_response.raise_for_status = MagicMock()
-        mock_post.return_value = mock_response
+    def test_http_call(self, spec, provider, fake_post):
+        """Raw HTTP call returns the response text and sends URL, auth, payload and 30s timeout."""
+        fake_post.payload = spec['response']('{"category": "ADAPTIVE"}')
 
-        provider = ai_providers.AnthropicProvider('test-key', {
-            'model': 'claude-3-haiku-20240307',
-            'max_tokens': 1024
-        })
-        result = provider.call('test prompt')
+        result = provider.call('prompt')
 
         assert result == '{"category": "ADAPTIVE"}'
-        mock_post.assert_called_once()
-
-    @patch('ai_providers.HAS_ANTHROPIC_SDK', False)
-    @patch('ai_providers.requests.post')
-    def test_http_call_headers(self, mock_post):
-        """HTTP call sends correct Anthropic headers."""
-        mock_response = MagicMock()
-        mock_response.json.return_value = {'content': [{'text': '{}'}]}
-        mock_response.raise_for_status = MagicMock()
-        mock_post.return_value = mock_response
-
-        provider = ai_providers.AnthropicProvider('my-api-key', {'model': 'test-model', 'max_tokens': 1024})
-        provider.call('prompt')
-
-        call_kwargs = mock_post.call_args
-        headers = call_kwargs.kwargs.get('headers') or call_kwargs[1].get('headers')
-        assert headers['x-api-key'] == 'my-api-key'
-        assert headers['anthropic-version'] == '2023-06-01'
-
-    @patch('ai_providers.HAS_ANTHROPIC_SDK', False)
-    @patch('ai_providers.requests.post')
-    def test_http_call_timeout(self, mock_post):
-        """HTTP call uses 30s timeout."""
-        mock_response = MagicMock()
-        mock_response.json.return_value = {'content': [{'text': '{}'}]}
-        mock_response.raise_for_status = MagicMock()
-        mock_post.return_value = mock_response
-
-        provider = ai_providers.AnthropicProvider('key', {'model': 'test', 'max_tokens': 1024})
-        provider.call('prompt')
-
-        call_kwargs = mock_post.call_args
-        timeout = call_kwargs.kwargs.get('timeout') or call_kwargs[1].get('timeout')
-        assert timeout == 30
-
-    @patch('ai_providers.HAS_ANTHROPIC_SDK', False)
-    @patch('ai_providers.requests.post')
-    def test_custom_base_url(self, mock_post):
-        """Custom base URL is used in HTTP call."""
-        mock_response = MagicMock()
-        mock_response.json.return_value = {'content': [{'text': '{}'}]}
-        mock_response.raise_for_status = MagicMock()
-        mock_post.return_value = mock_response
-
-        config = {
-            'model': 'test',
+        assert len(fake_post.calls) == 1
+        url, kwargs = fake_post.calls[0]
+        assert url == spec['base_url'] + spec['endpoint']
+        assert kwargs['headers'].items() >= spec['auth_headers']('test-key').items()
+        assert kwargs['json'] == {
+            'model': spec['model'],
             'max_tokens': 1024,
-            'api_base_url': 'https://custom.api.com'
+            'messages': [{'role': 'user', 'content': 'prompt'}],
         }
-        provider = ai_providers.AnthropicProvider('key', config)
-        provider.call('prompt')
-
-        call_args = mock_post.call_args
-        url = call_args.args[0] if call_args.args else call_args.kwargs.get('url', '')
-        assert url == 'https://custom.api.com/v1/messages'
+        assert kwargs['timeout'] == 30
 
+    def test_custom_base_url(self, spec, fake_post):
+        """Custom base URL is used in HTTP call (e.g. OpenAI-compatible APIs)."""
+        fake_post.payload = spec['response']('{}')
 
-class TestOpenAIProvider:
-    """Test OpenAIProvider class."""
+        _make_provider(spec, api_base_url=spec['custom_base_url']).call('prompt')
 
-    def test_env_var(self):
-        """Correct env var for OpenAI."""
-        assert ai_providers.OpenAIProvider.ENV_VAR == 'OPENAI_API_KEY'
-
-    def test_default_base_url(self):
-        """Default base URL for OpenAI comes from defaults module."""
-        provider = ai_providers.OpenAIProvider('test-key', {
-            'model': 'gpt-4o-mini',
-            'max_tokens': 1024
-        })
-        assert provider.base_url == defaults.DEFAULT_API_BASE_URLS['openai']
-        assert provider.base_url == 'https://api.openai.com/v1'
-
-    @patch('ai_providers.HAS_OPENAI_SDK', False)
-    def test_init_without_sdk(self):
-        """Initializes without SDK (client is None)."""
-        provider = ai_providers.OpenAIProvider('test-key', {'model': 'gpt-4o-mini', 'max_tokens': 1024})
-        assert provider.client is None
-        assert provider.api_key == 'test-key'
-
-    @patch('ai_providers.HAS_OPENAI_SDK', False)
-    @patch('ai_providers.requests.post')
-    def test_http_call_success(self, mock_post):
-        """Raw HTTP call returns response text."""
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            'choices': [{'message': {'content': '{"category": "ROUTINE"}'}}]
-        }
-        mock_response.raise_for_status = MagicMock()
-        mock_post.return_value = mock_response
-
-        provider = ai_providers.OpenAIProvider('test-key', {'model': 'gpt-4o-mini', 'max_tokens': 1024})
-        result = provider.call('test prompt')
-
-        assert result == '{"category": "ROUTINE"}'
-        mock_post.assert_called_once()
-
-    @patch('ai_providers.HAS_OPENAI_SDK', False)
-    @patch('ai_providers.requests.post')
-    def test_http_call_headers(self, mock_post):
-        """HTTP call sends correct OpenAI headers."""
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            'choices': [{'message': {'content': '{}'}}]
-        }
-        mock_response.raise_for_status = MagicMock()
-        mock_post.return_value = mock_response
-
-        provider = ai_providers.OpenAIProvider('my-openai-key', {'model': 'gpt-4o-mini', 'max_tokens': 1024})
-        provider.call('prompt')
-
-        call_kwargs = mock_post.call_args
-        headers = call_kwargs.kwargs.get('headers') or call_kwargs[1].get('headers')
-        assert headers['Authorization'] == 'Bearer my-openai-key'
-
-    @patch('ai_providers.HAS_OPENAI_SDK', False)
-    @patch('ai_providers.requests.post')
-    def test_custom_base_url(self, mock_post):
-        """Custom base URL for OpenAI-compatible APIs."""
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            'choices': [{'message': {'content': '{}'}}]
-        }
-        mock_response.raise_for_status = MagicMock()
-        mock_post.return_value = mock_response
-
-        config = {
-            'model': 'local-model',
-            'max_tokens': 1024,
-            'api_base_url': 'http://localhost:11434/v1'
-        }
-        provider = ai_providers.OpenAIProvider('key', config)
-        provider.call('prompt')
-
-        call_args = mock_post.call_args
-        url = call_args.args[0] if call_args.args else call_args.kwargs.get('url', '')
-        assert url == 'http://localhost:11434/v1/chat/completions'
-
-    @patch('ai_providers.HAS_OPENAI_SDK', False)
-    @patch('ai_providers.requests.post')
-    def test_http_call_timeout(self, mock_post):
-        """HTTP call uses 30s timeout."""
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            'choices': [{'message': {'content': '{}'}}]
-        }
-        mock_response.raise_for_status = MagicMock()
-        mock_post.return_value = mock_response
-
-        provider = ai_providers.OpenAIProvider('key', {'model': 'test', 'max_tokens': 1024})
-        provider.call('prompt')
-
-        call_kwargs = mock_post.call_args
-        timeout = call_kwargs.kwargs.get('timeout') or call_kwargs[1].get('timeout')
-        assert timeout == 30
+        url, _ = fake_post.calls[-1]
+        assert url == spec['custom_base_url'] + spec['endpoint']
 
 
 class TestProviderRegistry:
     """Test provider registry and factory functions."""
 
-    def test_providers_dict_has_anthropic(self):
-        """Registry contains anthropic."""
-        assert 'anthropic' in ai_providers.PROVIDERS
-
-    def test_providers_dict_has_openai(self):
-        """Registry contains openai."""
-        assert 'openai' in ai_providers.PROVIDERS
+    @pytest.mark.parametrize('name, class_name, sdk_flag', [
+        ('anthropic', 'AnthropicProvider', 'HAS_ANTHROPIC_SDK'),
+        ('openai', 'OpenAIProvider', 'HAS_OPENAI_SDK'),
+    ])
+    def test_registered_provider(self, monkeypatch, name, class_name, sdk_flag):
+        """Registry, lookup and factory all resolve the provider class."""
+        provider_cls = getattr(ai_providers, class_name)
+        assert ai_providers.PROVIDERS[name] is provider_cls
+        assert ai_providers.get_provider_class(name) is provider_cls
 
-    def test_get_provider_class_anthropic(self):
-        """get_provider_class returns AnthropicProvider."""
-        cls = ai_providers.get_provider_class('anthropic')
-        assert cls is ai_providers.AnthropicProvider
-
-    def test_get_provider_class_openai(self):
-        """get_provider_class returns OpenAIProvider."""
-        cls = ai_providers.get_provider_class('openai')
-        assert cls is ai_providers.OpenAIProvider
+        monkeypatch.setattr(ai_providers, sdk_flag, False)
+        provider = ai_providers.create_provider(name, 'key', {'model': 'test', 'max_tokens': 1024})
+        assert isinstance(provider, provider_cls)
 
     def test_get_provider_class_unknown(self):
         """Unknown provider returns None."""
         assert ai_providers.get_provider_class('gemini') is None
 
-    @patch('ai_providers.HAS_ANTHROPIC_SDK', False)
-    def test_create_provider_anthropic(self):
-        """Factory creates AnthropicProvider."""
-        provider = ai_providers.create_provider('anthropic', 'key', {'model': 'test', 'max_tokens': 1024})
-        assert isinstance(provider, ai_providers.AnthropicProvider)
-
-    @patch('ai_providers.HAS_OPENAI_SDK', False)
-    def test_create_provider_openai(self):
-        """Factory creates OpenAIProvider."""
-        provider = ai_providers.create_provider('openai', 'key', {'model': 'test', 'max_tokens': 1024})
-        assert isinstance(provider, ai_providers.OpenAIProvider)
-
-    @patch('ai_providers.HAS_ANTHROPIC_SDK', False)
-    def test_create_provider_missing_config_raises(self):
+    def test_create_provider_missing_config_raises(self, no_anthropic_sdk):
         """Provider with missing required config raises ValueError."""
         with pytest.raises(ValueError, match="missing required keys"):
             ai_providers.create_provider('anthropic', 'key', {'model': 'test'})
@@ -288,30 +139,24 @@ class TestProviderRegistry:
 class TestResolveApiKey:
     """Test API key resolution."""
 
-    def test_explicit_key_takes_priority(self):
-        """Explicit key overrides env var."""
-        result = ai_providers.resolve_api_key('anthropic', 'explicit-key')
-        assert result == 'explicit-key'
-
-    @patch.dict('os.environ', {'ANTHROPIC_API_KEY': 'env-anthropic-key'})
-    def test_anthropic_env_var(self):
-        """Falls back to ANTHROPIC_API_KEY env var."""
-        result = ai_providers.resolve_api_key('anthropic')
-        assert result == 'env-anthropic-key'
-
-    @patch.dict('os.environ', {'OPENAI_API_KEY': 'env-openai-key'})
-    def test_openai_env_var(self):
-        """Falls back to OPENAI_API_KEY env var."""
-        result = ai_providers.resolve_api_key('openai')
-        assert result == 'env-openai-key'
-
-    @patch.dict('os.environ', {}, clear=True)
-    def test_no_key_returns_none(self):
-        """Returns None when no key available."""
-        result = ai_providers.resolve_api_key('anthropic')
-        assert result is None
-
-    def test_unknown_provider_returns_none(self):
-        """Unknown provider with no explicit key returns None."""
-        result = ai_providers.resolve_api_key('unknown_provider')
-        assert result is None
+    @pytest.mark.parametrize('env, provider, explicit, expected', [
+        ({'ANTHROPIC_API_KEY': 'env-anthropic-key'}, 'anthropic', 'explicit-key', 'explicit-key'),
+        ({'ANTHROPIC_API_KEY': 'env-anthropic-key'}, 'anthropic', None, 'env-anthropic-key'),
+        ({'OPENAI_API_KEY': 'env-openai-key'}, 'openai', None, 'env-openai-key'),
+        ({}, 'anthropic', None, None),
+        ({'ANTHROPIC_API_KEY': 'env-anthropic-key'}, 'unknown_provider', None, None),
+    ], ids=[
+        'explicit-key-takes-priority',
+        'anthropic-env-var',
+        'openai-env-var',
+        'no-key',
+        'unknown-provider',
+    ])
+    def test_resolve_api_key(self, monkeypatch, env, provider, explicit, expected):
+        """Explicit key wins, then the provider's env var, else None."""
+        monkeypatch.delenv('ANTHROPIC_API_KEY', raising=False)
+        monkeypatch.delenv('OPENAI_API_KEY', raising=False)
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+
+        assert ai_providers.resolve_api_key(provider, explicit) == expected
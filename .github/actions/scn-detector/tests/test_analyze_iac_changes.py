@@ -3,28 +3,12 @@
 Tests for IaC change analysis.
 """
 
-import importlib.util
 import json
 import pytest
-import sys
-from pathlib import Path
-from unittest.mock import patch, MagicMock
+from subprocess import CalledProcessError, CompletedProcess
+from unittest.mock import Mock
 
-# Import module dynamically
-REPO_ROOT = Path(__file__).resolve().parents[4]
-SCRIPTS_DIR = REPO_ROOT / ".github" / "actions" / "scn-detector" / "scripts"
-
-# Add scripts dir to sys.path so sibling imports (from diff_helpers import ...) resolve
-if str(SCRIPTS_DIR) not in sys.path:
-    sys.path.insert(0, str(SCRIPTS_DIR))
-
-spec = importlib.util.spec_from_file_location(
-    "analyze_iac_changes",
-    SCRIPTS_DIR / "analyze_iac_changes.py"
-)
-analyze_iac_changes = importlib.util.module_from_spec(spec)
-sys.modules["analyze_iac_changes"] = analyze_iac_changes
-spec.loader.exec_module(analyze_iac_changes)
+import analyze_iac_changes
 
 
 pytestmark = pytest.mark.unit
@@ -33,6 +17,13 @@ pytestmark = pytest.mark.unit
 class TestIaCChangeAnalyzer:
     """Test IaCChangeAnalyzer class."""
 
+    @pytest.fixture(autouse=True)
+    def mock_run(self, monkeypatch):
+        """Replace subprocess.run for every test; configure return_value/side_effect inline."""
+        mock = Mock()
+        monkeypatch.setattr(analyze_iac_changes.subprocess, 'run', mock)
+        return mock
+
     @pytest.fixture
     def analyzer(self):
         """Create analyzer instance."""
@@ -43,18 +34,27 @@ class TestIaCChangeAnalyzer:
         assert analyzer.base_ref == 'main'
         assert analyzer.head_ref == 'HEAD'
 
-    def test_is_terraform_file(self, analyzer):
+    @pytest.mark.parametrize("filename,expected", [
+        ('main.tf', True),
+        ('vars.tfvars', True),
+        ('README.md', False),
+        ('app.py', False),
+        ('main.tf.bak', False),
+        ('modules/net/main.TF', False),
+    ])
+    def test_is_terraform_file(self, analyzer, filename, expected):
         """Test Terraform file detection."""
-        assert analyzer.is_terraform_file('main.tf') is True
-        assert analyzer.is_terraform_file('vars.tfvars') is True
-        assert analyzer.is_terraform_file('README.md') is False
-        assert analyzer.is_terraform_file('app.py') is False
-
-    def test_is_kubernetes_file_by_extension(self, analyzer):
+        assert analyzer.is_terraform_file(filename) is expected
+
+    @pytest.mark.parametrize("filename,expected", [
+        ('deploy.yaml', True),
+        ('service.yml', True),
+        ('app.py', False),
+        ('values.yaml.tmpl', False),
+    ])
+    def test_is_kubernetes_file_by_extension(self, analyzer, filename, expected):
         """Test Kubernetes file detection by extension."""
-        assert analyzer.is_kubernetes_file('deploy.yaml') is True
-        assert analyzer.is_kubernetes_file('service.yml') is True
-        assert analyzer.is_kubernetes_file('app.py') is False
+        assert analyzer.is_kubernetes_file(filename) is expected
 
     def test_is_kubernetes_file_with_content(self, analyzer):
         """Test Kubernetes file detection with content inspection."""
@@ -77,10 +77,10 @@ class TestIaCChangeAnalyzer:
         assert analyzer.determine_iac_format('main.tf') == 'terraform'
         assert analyzer.determine_iac_format('terraform.tfvars') == 'terraform'
 
-    @patch('analyze_iac_changes.subprocess.run')
     def test_get_changed_files_success(self, mock_run, analyzer):
         """Test getting changed files from git."""
-        mock_run.return_value = MagicMock(
+        mock_run.return_value = CompletedProcess(
+            args=['git'],
             stdout="main.tf\nservice.yaml\nREADME.md\n",
             returncode=0
         )
@@ -91,20 +91,18 @@ class TestIaCChangeAnalyzer:
         assert 'main.tf' in files
         assert 'service.yaml' in files
 
-    @patch('analyze_iac_changes.subprocess.run')
     def test_get_changed_files_error(self, mock_run, analyzer):
         """Test handling of git diff error."""
-        from subprocess import CalledProcessError
         mock_run.side_effect = CalledProcessError(1, 'git', stderr='fatal: bad ref')
 
         files = analyzer.get_changed_files()
 
         assert files == []
 
-    @patch('analyze_iac_changes.subprocess.run')
     def test_get_file_diff_success(self, mock_run, analyzer):
         """Test getting file diff."""
-        mock_run.return_value = MagicMock(
+        mock_run.return_value = CompletedProcess(
+            args=['git'],
             stdout='diff --git a/main.tf b/main.tf\n+resource "aws_instance" "web" {}\n',
             returncode=0
         )
@@ -114,10 +112,8 @@ class TestIaCChangeAnalyzer:
         assert diff is not None
         assert 'aws_instance' in diff
 
-    @patch('analyze_iac_changes.subprocess.run')
     def test_get_file_diff_error(self, mock_run, analyzer):
         """Test handling of diff retrieval error."""
-        from subprocess import CalledProcessError
         mock_run.side_effect = CalledProcessError(1, 'git', stderr='error')
 
         diff = analyzer.get_file_diff('missing.tf')
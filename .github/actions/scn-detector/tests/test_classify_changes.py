@@ -3,50 +3,89 @@
 Tests for SCN classification engine
 """
 
-import importlib.util
+import io
 import json
 import pytest
-import sys
-from pathlib import Path
-from unittest.mock import patch, MagicMock
-
-# Add scripts directory to path
-REPO_ROOT = Path(__file__).resolve().parents[4]
-SCRIPTS_DIR = REPO_ROOT / ".github" / "actions" / "scn-detector" / "scripts"
-FIXTURES_DIR = REPO_ROOT / "tests" / "fixtures" / "scn-detector"
-
-if str(SCRIPTS_DIR) not in sys.path:
-    sys.path.insert(0, str(SCRIPTS_DIR))
-
-# Import classify_changes module dynamically
-spec = importlib.util.spec_from_file_location(
-    "classify_changes",
-    SCRIPTS_DIR / "classify_changes.py"
-)
-classify_changes = importlib.util.module_from_spec(spec)
-sys.modules["classify_changes"] = classify_changes
-spec.loader.exec_module(classify_changes)
+import re
+import yaml
+from types import MappingProxyType, SimpleNamespace
+
+import classify_changes
 
 
 # Mark all tests as unit tests
 pytestmark = pytest.mark.unit
 
+# Read-only change inputs shared by the rule classification tests
+_CHANGE_TAGS = MappingProxyType({
+    'type': 'aws_instance',
+    'name': 'web',
+    'operation': 'modify',
+    'attributes_changed': ('tags',),
+    'diff': 'tags = { Name = "updated" }'
+})
+_CHANGE_INSTANCE_TYPE = MappingProxyType({
+    'type': 'aws_instance',
+    'name': 'app_server',
+    'operation': 'modify',
+    'attributes_changed': ('instance_type',),
+    'diff': '- instance_type = "t2.micro"\n+ instance_type = "t3.small"'
+})
+_CHANGE_DB_ENGINE = MappingProxyType({
+    'type': 'aws_rds_cluster',
+    'name': 'main',
+    'operation': 'modify',
+    'attributes_changed': ('engine',),
+    'diff': '- engine = "postgres"\n+ engine = "aurora-postgresql"'
+})
+_CHANGE_DELETE_ENCRYPTION = MappingProxyType({
+    'type': 'aws_s3_bucket',
+    'name': 'data',
+    'operation': 'delete',
+    'attributes_changed': ('server_side_encryption_configuration',),
+    'diff': '- encryption { ... }'
+})
+_CHANGE_UNKNOWN = MappingProxyType({
+    'type': 'unknown_resource',
+    'name': 'test',
+    'operation': 'create',
+    'attributes_changed': (),
+    'diff': ''
+})
+
+# Rules whose regex escapes span several characters (octal, hex, named)
+_ESCAPE_RULES = (
+    {'pattern': r'\x41ttr', 'description': 'Hex escape'},
+    {'pattern': r'\101ttr', 'description': 'Octal escape'},
+    {'resource': r'aws_\u0069nstance\.\N{LATIN SMALL LETTER W}eb', 'description': 'Unicode escapes'},
+    {'attribute': r'\U00000074ag\x73', 'operation': 'delete', 'description': 'Wide hex escape'},
+)
+
+
+@pytest.fixture(scope="session")
+def minimal_config(fixtures_dir):
+    """Minimal test config, parsed once per session (treat as read-only)."""
+    config_path = fixtures_dir / "config" / "scn-config-minimal.yml"
+    return yaml.load(config_path.read_bytes(), Loader=classify_changes._SafeLoader)
+
+
+@pytest.fixture(scope="class")
+def shared_classifier(minimal_config):
+    """Classifier with minimal config, built once per test class."""
+    return classify_changes.ChangeClassifier(config=minimal_config)
+
 
 class TestChangeClassifier:
     """Test ChangeClassifier class."""
 
     @pytest.fixture
-    def minimal_config(self):
-        """Load minimal test config."""
-        config_path = FIXTURES_DIR / "config" / "scn-config-minimal.yml"
-        with open(config_path, 'r') as f:
-            import yaml
-            return yaml.safe_load(f)
-
-    @pytest.fixture
-    def classifier(self, minimal_config):
-        """Create classifier instance with minimal config."""
-        return classify_changes.ChangeClassifier(config=minimal_config)
+    def classifier(self, shared_classifier):
+        """Class-shared classifier; AI attributes mutated by a test are restored after it."""
+        saved = {attr: getattr(shared_classifier, attr)
+                 for attr in ('enable_ai', 'api_key', '_ai_classifier')}
+        yield shared_classifier
+        for attr, value in saved.items():
+            setattr(shared_classifier, attr, value)
 
     def test_initialization_default_rules(self):
         """Test classifier initializes with default rules."""
@@ -118,97 +157,154 @@ class TestChangeClassifier:
 
         assert classifier.match_rule(change, rule) is True
 
-    def test_classify_with_rules_routine(self, classifier):
-        """Test classification of routine change."""
-        change = {
-            'type': 'aws_instance',
-            'name': 'web',
-            'operation': 'modify',
-            'attributes_changed': ['tags'],
-            'diff': 'tags = { Name = "updated" }'
-        }
-
-        result = classifier.classify_with_rules(change)
-
-        assert result is not None
-        category, rule = result
-        assert category == 'ROUTINE'
-
-    def test_classify_with_rules_adaptive(self, classifier):
-        """Test classification of adaptive change."""
-        change = {
-            'type': 'aws_instance',
-            'name': 'app_server',
-            'operation': 'modify',
-            'attributes_changed': ['instance_type'],
-            'diff': '- instance_type = "t2.micro"\n+ instance_type = "t3.small"'
-        }
-
+    @pytest.mark.parametrize("change,expected_category", [
+        pytest.param(_CHANGE_TAGS, 'ROUTINE', id='routine'),
+        pytest.param(_CHANGE_INSTANCE_TYPE, 'ADAPTIVE', id='adaptive'),
+        pytest.param(_CHANGE_DB_ENGINE, 'TRANSFORMATIVE', id='transformative'),
+        pytest.param(_CHANGE_DELETE_ENCRYPTION, 'IMPACT', id='impact'),
+        pytest.param(_CHANGE_UNKNOWN, None, id='no-match'),
+    ])
+    def test_classify_with_rules(self, classifier, change, expected_category):
+        """Test rule-based classification for each SCN category."""
         result = classifier.classify_with_rules(change)
 
-        assert result is not None
-        category, rule = result
-        assert category == 'ADAPTIVE'
-
-    def test_classify_with_rules_transformative(self, classifier):
-        """Test classification of transformative change."""
-        change = {
-            'type': 'aws_rds_cluster',
-            'name': 'main',
-            'operation': 'modify',
-            'attributes_changed': ['engine'],
-            'diff': '- engine = "postgres"\n+ engine = "aurora-postgresql"'
-        }
-
-        result = classifier.classify_with_rules(change)
-
-        assert result is not None
-        category, rule = result
-        assert category == 'TRANSFORMATIVE'
-
-    def test_classify_with_rules_impact(self, classifier):
-        """Test classification of impact change."""
-        change = {
-            'type': 'aws_s3_bucket',
-            'name': 'data',
-            'operation': 'delete',
-            'attributes_changed': ['server_side_encryption_configuration'],
-            'diff': '- encryption { ... }'
-        }
-
-        result = classifier.classify_with_rules(change)
-
-        assert result is not None
-        category, rule = result
-        assert category == 'IMPACT'
-
-    def test_classify_with_rules_no_match(self, classifier):
-        """Test classification when no rule matches."""
-        change = {
-            'type': 'unknown_resource',
-            'name': 'test',
-            'operation': 'create',
-            'attributes_changed': [],
-            'diff': ''
-        }
-
-        result = classifier.classify_with_rules(change)
-
-        assert result is None
+        if expected_category is None:
+            assert result is None
+        else:
+            category, rule = result
+            assert category == expected_category
+
+    def test_rule_patterns_compiled_once(self, classifier):
+        """Rule regexes are compiled at construction and reused by match_rule."""
+        rule = classifier.rules['routine'][0]
+        source = next(rule[key] for key in ('pattern', 'resource', 'attribute') if key in rule)
+        compiled = classifier._compiled_patterns[source]
+
+        assert compiled.search(source.replace('.*', '').upper())
+        classifier.match_rule({'type': 'x', 'name': 'y', 'diff': ''}, rule)
+        assert classifier._compiled_patterns[source] is compiled
+        assert id(classifier._matcher(source)) == id(compiled)
+
+    @pytest.mark.parametrize("pattern,text,expected", [
+        ('ingress', 'aws_security_group.web INGRESS cidr', True),
+        ('Description', 'description = "updated"', True),
+        ('egress', 'ingress only', False),
+    ])
+    def test_literal_rule_pattern_skips_regex(self, classifier, monkeypatch, pattern, text, expected):
+        """Patterns without regex syntax match as case-insensitive substrings."""
+        monkeypatch.setattr(re, 'compile', lambda *args, **kwargs: pytest.fail('regex compiled'))
+        matcher = classifier._matcher(pattern)
+
+        assert matcher.search(text) is expected
+
+    def test_regex_rule_pattern_still_compiled(self, monkeypatch):
+        """Without RE2, patterns with metacharacters compile with re.IGNORECASE."""
+        monkeypatch.setattr(classify_changes, 'HAS_RE2', False)
+        matcher = classify_changes._compile_regex(r'aws_(s3|rds)_.*')
+
+        assert isinstance(matcher, re.Pattern)
+        assert matcher.flags & re.IGNORECASE
+        assert matcher.search('AWS_RDS_CLUSTER.main')
+
+    def test_re2_used_for_rule_regexes(self):
+        """RE2 compiles rule regexes in linear time when installed."""
+        pytest.importorskip('re2')
+        matcher = classify_changes._compile_regex(r'(a+)+b')
+
+        # Checked first: on re this search would backtrack catastrophically
+        assert not isinstance(matcher, re.Pattern)
+        assert not matcher.search('a' * 100_000 + 'c')
+        assert matcher.search('xaab')
+        assert classify_changes._compile_regex(r'AWS_(s3|rds)_.*').search('aws_rds_cluster')
+
+    @pytest.mark.parametrize("pattern,text,expected", [
+        (r'engine$', 'engine\n', True),
+        (r'engine$', 'engine', True),
+        (r'engine$', 'engine\n\n', False),
+        (r'^(a|b)$|tags', 'b\n', True),
+        (r'engine\Z', 'engine\n', False),
+    ])
+    def test_re2_end_anchors_match_re(self, pattern, text, expected):
+        """A trailing $ runs on RE2 and still matches before a final newline."""
+        pytest.importorskip('re2')
+        matcher = classify_changes._compile_regex(pattern)
+
+        assert not isinstance(matcher, re.Pattern)
+        assert bool(matcher.search(text)) is expected
+        assert bool(re.search(pattern, text)) is expected
+
+    def test_re2_guards_anchored_redos(self):
+        """Anchored patterns like (a+)+$ no longer fall back to backtracking re."""
+        pytest.importorskip('re2')
+        matcher = classify_changes._compile_regex(r'(a+)+$')
+
+        assert not isinstance(matcher, re.Pattern)
+        assert not matcher.search('a' * 100_000 + 'c')
+        assert matcher.search('aaa\n')
+
+    @pytest.mark.parametrize("pattern,text", [
+        (r'(tags)\1', 'TAGSTAGS'),
+        (r'tags(?=\.name)', 'tags.name'),
+        (r'engine$\n', 'engine\n'),
+        (r'(?m)^engine$', 'engine\nx'),
+    ])
+    def test_re2_falls_back_to_re(self, pattern, text):
+        """Syntax RE2 rejects, mid-pattern $ and MULTILINE stay on re."""
+        pytest.importorskip('re2')
+        matcher = classify_changes._compile_regex(pattern)
+
+        assert isinstance(matcher, re.Pattern)
+        assert matcher.search(text)
+
+    def test_default_rules_compiled_once_per_process(self):
+        """Default-rule classifiers share compiled matchers; custom rules get their own."""
+        first = classify_changes.ChangeClassifier()
+        second = classify_changes.ChangeClassifier(config={'version': '2'})
+        custom = classify_changes.ChangeClassifier(
+            config={'rules': {'routine': [{'pattern': r'tags\.'}]}})
+
+        source = next(iter(first._compiled_patterns))
+        assert second._compiled_patterns[source] is first._compiled_patterns[source]
+        assert second._rule_table is first._rule_table
+        assert r'tags\.' in custom._compiled_patterns
+        assert r'tags\.' not in first._compiled_patterns
+
+        first._matcher('ad_hoc_only')
+        assert 'ad_hoc_only' not in second._compiled_patterns
+
+    def test_ad_hoc_rule_pattern_compiled_on_first_use(self, classifier):
+        """Patterns from rules outside the config are compiled lazily and cached."""
+        rule = {'attribute': r'.*kms_key.*'}
+        assert rule['attribute'] not in classifier._compiled_patterns
+
+        assert classifier.match_rule({'attributes_changed': ['KMS_KEY_ID']}, rule) is True
+        assert rule['attribute'] in classifier._compiled_patterns
+
+    def test_no_reparse_per_classify(self, classifier, monkeypatch):
+        """classify_change never re-reads config or recompiles rule patterns."""
+        calls = []
+        for name in ('load', 'safe_load'):
+            monkeypatch.setattr(yaml, name, lambda *args, _name=name, **kwargs: calls.append(_name))
+        for name in ('compile', 'search', 'match'):
+            monkeypatch.setattr(re, name, lambda *args, _name=name, **kwargs: calls.append(f're.{_name}'))
+
+        for change in (_CHANGE_TAGS, _CHANGE_DB_ENGINE, _CHANGE_UNKNOWN) * 50:
+            classifier.classify_change(dict(change))
+
+        assert calls == []
 
     def test_classify_with_ai_success(self, classifier):
         """Test AI classification success via mocked AIClassifier."""
         classifier.enable_ai = True
         classifier.api_key = 'test-api-key'
 
-        # Mock the AI classifier
-        mock_ai = MagicMock()
-        mock_ai.classify.return_value = {
+        # Stub the AI classifier
+        response = {
             'category': 'TRANSFORMATIVE',
             'confidence': 0.95,
             'reasoning': 'Test'
         }
-        classifier._ai_classifier = mock_ai
+        classifier._ai_classifier = SimpleNamespace(classify=lambda change: response)
 
         change = {
             'type': 'aws_rds_cluster',
@@ -229,14 +325,13 @@ class TestChangeClassifier:
         classifier.enable_ai = True
         classifier.api_key = 'test-api-key'
 
-        # Mock the AI classifier returning low confidence
-        mock_ai = MagicMock()
-        mock_ai.classify.return_value = {
+        # Stub the AI classifier returning low confidence
+        response = {
             'category': 'MANUAL_REVIEW',
             'confidence': 0.65,
             'reasoning': 'Low confidence (0.65 < 0.8): Uncertain'
         }
-        classifier._ai_classifier = mock_ai
+        classifier._ai_classifier = SimpleNamespace(classify=lambda change: response)
 
         change = {'type': 'test', 'name': 'test', 'operation': 'modify', 'attributes_changed': [], 'diff': ''}
 
@@ -274,12 +369,101 @@ class TestChangeClassifier:
         assert result['confidence'] == 1.0
 
 
+class TestRulePrefilter:
+    """Test the required-literal prefilter in classify_with_rules."""
+
+    @pytest.mark.parametrize("pattern,expected", [
+        ('tags.*', 'tags'),
+        ('aws_autoscaling_group.*.desired_capacity', 'aws_autoscaling_group'),
+        (r'aws_rds_.*\.engine', 'aws_rds_'),
+        ('tags?', 'tag'),
+        ('a{100}bcd', 'bcd'),
+        ('.*Effect.*:.*Allow.*', 'effect'),
+        ('threshold|evaluation_periods', None),
+        ('.*[Aa]dmin.*', None),
+        (r'\s*\*', None),
+        (r'\x41bc', 'bc'),
+        (r'\101ttr', 'ttr'),
+        (r'\0tags', 'tags'),
+        (r'\u0061ttr', 'ttr'),
+        (r'\U00000061ttr', 'ttr'),
+        (r'\N{LATIN SMALL LETTER A}ttr', 'ttr'),
+        (r'tags\.\d+', 'tags'),
+    ])
+    def test_required_literal(self, pattern, expected):
+        """Only literals every match must contain are extracted."""
+        assert classify_changes._required_literal(pattern) == expected
+
+    def test_rule_table_in_priority_order(self):
+        """Rules are flattened once, category by category, with their literal."""
+        classifier = classify_changes.ChangeClassifier()
+        categories = [category for category, _, _ in classifier._rule_table]
+
+        expected = [category.upper() for category in classify_changes.CATEGORY_ORDER
+                    for _ in classifier.rules.get(category) or []]
+        assert categories == expected
+        assert ('ROUTINE', classifier.rules['routine'][0]) == classifier._rule_table[0][:2]
+
+    def test_rules_without_literal_hit_are_skipped(self, monkeypatch):
+        """match_rule only runs for rules whose required literal is present."""
+        classifier = classify_changes.ChangeClassifier()
+        checked = []
+        original = classifier.match_rule
+        monkeypatch.setattr(classifier, 'match_rule',
+                            lambda change, rule, *args: checked.append(rule) or original(change, rule, *args))
+
+        classifier.classify_with_rules(dict(_CHANGE_DB_ENGINE))
+
+        total = sum(len(rules) for rules in classifier.rules.values())
+        assert 0 < len(checked) < total
+
+    def test_match_text_built_once_per_change(self, monkeypatch):
+        """The pattern text is built once and shared by every rule checked."""
+        classifier = classify_changes.ChangeClassifier()
+        built = []
+        original = classify_changes.ChangeClassifier._match_text
+        monkeypatch.setattr(classifier, '_match_text',
+                            lambda change: built.append(change) or original(change))
+
+        classifier.classify_with_rules(dict(_CHANGE_UNKNOWN))
+
+        assert len(built) == 1
+
+    @pytest.mark.parametrize("change", [
+        _CHANGE_TAGS, _CHANGE_INSTANCE_TYPE, _CHANGE_DB_ENGINE, _CHANGE_DELETE_ENCRYPTION, _CHANGE_UNKNOWN,
+        {'type': 'aws_security_group', 'name': 'web', 'operation': 'modify',
+         'attributes_changed': ['ingress'], 'diff': '+ cidr_blocks = ["0.0.0.0/0"]'},
+        {'type': 'aws_iam_policy', 'name': 'admin', 'operation': 'modify',
+         'attributes_changed': ['policy'], 'diff': '"Effect": "Allow", "Action": "*"'},
+        {'type': 'AWS_KMS_KEY', 'name': 'main', 'operation': 'create', 'attributes_changed': [], 'diff': ''},
+        {'type': 'aws_ınstance', 'name': 'web', 'operation': 'modify',
+         'attributes_changed': ['instance_type'], 'diff': ''},
+        {'type': 'x', 'name': 'y', 'operation': 'modify', 'attributes_changed': ['Attr'], 'diff': ''},
+        {'type': 'aws_instance', 'name': 'WEB', 'operation': 'delete', 'attributes_changed': [], 'diff': ''},
+        {'type': 'aws_lb', 'name': 'main', 'operation': 'delete', 'attributes_changed': ['tags'], 'diff': ''},
+    ], ids=lambda change: f"{change['type']}-{change['operation']}")
+    def test_prefilter_preserves_results(self, change):
+        """Prefiltered classification equals checking every rule in order."""
+        rules = {category: list(rules) for category, rules in classify_changes.DEFAULT_RULES.items()}
+        rules['routine'] = list(_ESCAPE_RULES) + rules.get('routine', [])
+        classifier = classify_changes.ChangeClassifier(config={'rules': rules})
+        unfiltered = next(
+            ((category.upper(), rule)
+             for category in ('routine', 'adaptive', 'transformative', 'impact')
+             for rule in classifier.rules.get(category, [])
+             if classifier.match_rule(change, rule)),
+            None,
+        )
+
+        assert classifier.classify_with_rules(change) == unfiltered
+
+
 class TestConfigLoading:
     """Test configuration loading."""
 
-    def test_load_valid_config(self):
+    def test_load_valid_config(self, fixtures_dir):
         """Test loading valid YAML config."""
-        config_path = FIXTURES_DIR / "config" / "scn-config-minimal.yml"
+        config_path = fixtures_dir / "config" / "scn-config-minimal.yml"
 
         classifier = classify_changes.ChangeClassifier()
         config = classifier.load_config_from_file(str(config_path))
@@ -294,6 +478,30 @@ class TestConfigLoading:
 
         assert config == {}
 
+    def test_load_config_utf8_bytes(self, tmp_path):
+        """Config files are handed to the YAML parser as raw UTF-8 bytes."""
+        config_file = tmp_path / 'config.yml'
+        config_file.write_bytes(
+            'version: "1.0"\nname: "Profil détaillé ✓"\nrules:\n'
+            '  routine:\n    - pattern: "tags.*"\n      description: "Étiquettes"\n'.encode('utf-8')
+        )
+
+        classifier = classify_changes.ChangeClassifier()
+        config = classifier.load_config_from_file(str(config_file))
+
+        assert config['name'] == 'Profil détaillé ✓'
+
+    def test_load_config_rejects_unsafe_tags(self, tmp_path, capsys):
+        """Config YAML goes through a safe loader (libyaml when available)."""
+        assert classify_changes._SafeLoader in (yaml.SafeLoader, getattr(yaml, 'CSafeLoader', None))
+        config_file = tmp_path / 'unsafe.yml'
+        config_file.write_text('!!python/object/apply:os.system ["true"]\n')
+
+        classifier = classify_changes.ChangeClassifier()
+
+        assert classifier.load_config_from_file(str(config_file)) is None
+        assert 'Invalid YAML' in capsys.readouterr().err
+
 
 class TestEdgeCases:
     """Test edge cases and error handling."""
@@ -312,6 +520,28 @@ class TestEdgeCases:
         assert result['summary']['routine'] == 0
         assert result['summary']['adaptive'] == 0
 
+    def test_identical_changes_classified_once(self, monkeypatch):
+        """Duplicate changes reuse one classification but keep their own file."""
+        classifier = classify_changes.ChangeClassifier()
+        calls = []
+        original = classifier.classify_change
+        monkeypatch.setattr(classifier, 'classify_change',
+                            lambda change: calls.append(change) or original(change))
+        renamed = dict(_CHANGE_TAGS, name='other')
+        changes_data = {'changes': [
+            {'file': 'a.tf', 'resources': [dict(_CHANGE_TAGS), renamed]},
+            {'file': 'b.tf', 'resources': [dict(_CHANGE_TAGS)]},
+        ]}
+
+        result = classifier.classify_all_changes(changes_data)
+
+        assert len(calls) == 2
+        first, second, third = result['classifications']
+        assert [first['file'], third['file']] == ['a.tf', 'b.tf']
+        assert first is not third
+        assert second['resource'] == 'aws_instance.other'
+        assert result['summary']['routine'] == 3
+
     def test_malformed_change_data(self):
         """Test handling of malformed change data."""
         classifier = classify_changes.ChangeClassifier()
@@ -335,15 +565,16 @@ class TestProviderConfiguration:
         classifier = classify_changes.ChangeClassifier()
         assert classifier.ai_config.get('provider') == 'anthropic'
 
-    @patch.dict('os.environ', {'ANTHROPIC_API_KEY': 'anthro-key'})
-    def test_anthropic_api_key_resolved(self):
+    def test_anthropic_api_key_resolved(self, monkeypatch):
         """Anthropic API key resolved from env var."""
+        monkeypatch.setenv('ANTHROPIC_API_KEY', 'anthro-key')
         classifier = classify_changes.ChangeClassifier()
         assert classifier.api_key == 'anthro-key'
 
-    @patch.dict('os.environ', {'OPENAI_API_KEY': 'openai-key'}, clear=True)
-    def test_openai_api_key_resolved(self):
+    def test_openai_api_key_resolved(self, monkeypatch):
         """OpenAI API key resolved when provider is openai."""
+        monkeypatch.delenv('ANTHROPIC_API_KEY', raising=False)
+        monkeypatch.setenv('OPENAI_API_KEY', 'openai-key')
         config = {
             'ai_fallback': {
                 'provider': 'openai',
@@ -354,9 +585,9 @@ class TestProviderConfiguration:
         classifier = classify_changes.ChangeClassifier(config=config)
         assert classifier.api_key == 'openai-key'
 
-    def test_openai_config_from_fixture(self):
+    def test_openai_config_from_fixture(self, fixtures_dir):
         """OpenAI config loaded from fixture file."""
-        config_path = FIXTURES_DIR / "config" / "scn-config-openai.yml"
+        config_path = fixtures_dir / "config" / "scn-config-openai.yml"
         if not config_path.exists():
             pytest.skip("OpenAI fixture not yet created")
 
@@ -423,6 +654,60 @@ max_tokens: 2048
         assert 'classifications' in output_data
         assert 'summary' in output_data
 
+    def test_main_json_io(self, tmp_path, monkeypatch, has_orjson):
+        """main() reads input and writes indented output with or without orjson."""
+        input_file = tmp_path / "input.json"
+        input_file.write_text(json.dumps({'changes': [{'file': 'main.tf', 'resources': [dict(_CHANGE_TAGS)]}]}))
+        output_file = tmp_path / "out" / "output.json"
+        monkeypatch.setattr('sys.argv', [
+            'classify_changes.py', '--input', str(input_file), '--output', str(output_file),
+        ])
+
+        assert classify_changes.main() == 0
+
+        text = output_file.read_text(encoding='utf-8')
+        assert text.startswith('{\n  "classifications"')
+        assert json.loads(text)['classifications'][0]['category'] == 'ROUTINE'
+
+    def test_main_reads_input_from_stdin(self, tmp_path, monkeypatch):
+        """--input - reads the change set from stdin without touching the filesystem."""
+        payload = json.dumps({'changes': [{'file': 'main.tf', 'resources': [dict(_CHANGE_DB_ENGINE)]}]})
+        monkeypatch.setattr('sys.stdin', io.TextIOWrapper(io.BytesIO(payload.encode('utf-8'))))
+        output_file = tmp_path / "output.json"
+        monkeypatch.setattr('sys.argv', [
+            'classify_changes.py', '--input', '-', '--output', str(output_file),
+        ])
+
+        assert classify_changes.main() == 0
+        assert json.loads(output_file.read_text())['summary']['transformative'] == 1
+
+    def test_main_invalid_input_json(self, tmp_path, monkeypatch, capsys, has_orjson):
+        """Malformed input JSON is reported whichever parser is used."""
+        input_file = tmp_path / "input.json"
+        input_file.write_text("{ not json")
+        monkeypatch.setattr('sys.argv', [
+            'classify_changes.py', '--input', str(input_file), '--output', str(tmp_path / "output.json"),
+        ])
+
+        assert classify_changes.main() == 1
+        assert 'Invalid JSON in input file' in capsys.readouterr().err
+
+    def test_main_invalid_rule_pattern(self, tmp_path, monkeypatch, capsys):
+        """A rule regex that does not compile is reported instead of raising."""
+        input_file = tmp_path / "input.json"
+        input_file.write_text(json.dumps({'changes': []}))
+        config_file = tmp_path / "profile.yml"
+        config_file.write_text(yaml.dump({'version': '1.0', 'rules': {'routine': [{'pattern': 'tags([', 'description': 'Tags'}]}}))
+        monkeypatch.setattr('sys.argv', [
+            'classify_changes.py',
+            '--input', str(input_file),
+            '--output', str(tmp_path / "output.json"),
+            '--config', str(config_file),
+        ])
+
+        assert classify_changes.main() == 1
+        assert "Invalid rule pattern 'tags(['" in capsys.readouterr().err
+
     def test_main_with_missing_ai_config_file(self, tmp_path, monkeypatch, capsys):
         """Test main() with missing AI config file (should fail since user explicitly specified it)."""
         # Create test input file
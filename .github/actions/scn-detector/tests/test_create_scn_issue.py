@@ -3,25 +3,15 @@
 Tests for SCN issue creation.
 """
 
-import importlib.util
 import json
 import os
 import pytest
-import sys
-from pathlib import Path
-from unittest.mock import patch, MagicMock
+import re
+import requests
+from types import SimpleNamespace
+from unittest.mock import patch
 
-# Import module dynamically
-REPO_ROOT = Path(__file__).resolve().parents[4]
-SCRIPTS_DIR = REPO_ROOT / ".github" / "actions" / "scn-detector" / "scripts"
-
-spec = importlib.util.spec_from_file_location(
-    "create_scn_issue",
-    SCRIPTS_DIR / "create_scn_issue.py"
-)
-create_scn_issue = importlib.util.module_from_spec(spec)
-sys.modules["create_scn_issue"] = create_scn_issue
-spec.loader.exec_module(create_scn_issue)
+import create_scn_issue
 
 
 pytestmark = pytest.mark.unit
@@ -52,6 +42,35 @@ class TestSCNIssueCreatorInit:
         assert creator.github_token == 'my-token'
         assert creator.repo == 'org/repo'
 
+    def test_session_created_lazily(self):
+        """No HTTP session is built until the API is actually used."""
+        creator = create_scn_issue.SCNIssueCreator(
+            'token', 'org/repo', 'https://github.com'
+        )
+        assert creator._session is None
+        session = creator.session
+        assert creator.session is session
+
+    def test_session_auth_headers(self):
+        """Session carries the auth and accept headers for every request."""
+        creator = create_scn_issue.SCNIssueCreator(
+            'my-token', 'org/repo', 'https://github.com'
+        )
+        assert creator.session.headers['Authorization'] == 'token my-token'
+        assert creator.session.headers['Accept'] == 'application/vnd.github.v3+json'
+
+    def test_session_retry_policy(self):
+        """HTTPS adapter never replays POSTs on 5xx; the write may already have happened."""
+        creator = create_scn_issue.SCNIssueCreator(
+            'token', 'org/repo', 'https://github.com'
+        )
+        retry = creator.session.get_adapter('https://api.github.com').max_retries
+        assert retry.total == create_scn_issue.HTTP_RETRY_TOTAL
+        assert 502 in retry.status_forcelist
+        assert 'POST' not in retry.allowed_methods
+        assert not retry.is_retry('POST', 502)
+        assert retry.is_retry('GET', 502)
+
 
 class TestCalculateDueDates:
     """Test due date calculation."""
@@ -89,7 +108,6 @@ class TestCalculateDueDates:
     def test_dates_are_date_strings(self, creator):
         """Dates are formatted as YYYY-MM-DD."""
         dates = creator.calculate_due_dates('ADAPTIVE')
-        import re
         assert re.match(r'\d{4}-\d{2}-\d{2}', dates['post_completion'])
 
 
@@ -251,43 +269,178 @@ class TestCreateIssue:
             'token', 'org/repo', 'https://github.com'
         )
 
-    @patch('create_scn_issue.requests.post')
-    def test_create_issue_success(self, mock_post, creator):
+    def test_create_issue_success(self, creator, fake_response):
         """Successful issue creation returns issue number."""
-        mock_response = MagicMock()
-        mock_response.json.return_value = {'number': 123}
-        mock_response.raise_for_status = MagicMock()
-        mock_post.return_value = mock_response
-
-        result = creator.create_issue('Title', 'Body', ['scn'])
+        with patch.object(creator.session, 'post', return_value=fake_response({'number': 123})) as mock_post:
+            result = creator.create_issue('Title', 'Body', ['scn'])
 
         assert result == 123
         mock_post.assert_called_once()
+        assert mock_post.call_args.kwargs['json']['labels'] == ['scn']
 
-    @patch('create_scn_issue.requests.post')
-    def test_create_issue_http_error(self, mock_post, creator):
+    def test_create_issue_http_error(self, creator):
         """HTTP error returns None."""
-        mock_response = MagicMock()
-        mock_response.text = 'Unauthorized'
-        mock_post.return_value = mock_response
-        mock_response.raise_for_status.side_effect = (
-            __import__('requests').exceptions.HTTPError(response=mock_response)
-        )
+        def raise_for_status():
+            raise requests.exceptions.HTTPError(response=response)
+
+        response = SimpleNamespace(text='Unauthorized', raise_for_status=raise_for_status)
 
-        result = creator.create_issue('Title', 'Body', ['scn'])
+        with patch.object(creator.session, 'post', return_value=response):
+            result = creator.create_issue('Title', 'Body', ['scn'])
 
         assert result is None
 
-    @patch('create_scn_issue.requests.post')
-    def test_create_issue_connection_error(self, mock_post, creator):
+    def test_create_issue_connection_error(self, creator):
         """Connection error returns None."""
-        mock_post.side_effect = Exception("Connection refused")
-
-        result = creator.create_issue('Title', 'Body', ['scn'])
+        with patch.object(creator.session, 'post', side_effect=Exception("Connection refused")):
+            result = creator.create_issue('Title', 'Body', ['scn'])
 
         assert result is None
 
 
+class TestCreateIssuesBatch:
+    """Test GraphQL batched issue creation."""
+
+    @pytest.fixture
+    def creator(self):
+        creator = create_scn_issue.SCNIssueCreator(
+            'token', 'org/repo', 'https://github.com'
+        )
+        creator._repository_id = 'R_1'
+        creator._label_ids = {'scn': 'LA_1'}
+        return creator
+
+    @staticmethod
+    def _issues(count):
+        return [{'title': f'T{i}', 'body': 'B', 'labels': ['scn']} for i in range(count)]
+
+    def test_graphql_url(self):
+        """GraphQL endpoint derived for github.com and GHES."""
+        dotcom = create_scn_issue.SCNIssueCreator('t', 'org/repo', 'https://github.com')
+        ghes = create_scn_issue.SCNIssueCreator('t', 'org/repo', 'https://ghes.company.com')
+        assert dotcom.graphql_url == 'https://api.github.com/graphql'
+        assert ghes.graphql_url == 'https://ghes.company.com/api/graphql'
+
+    def test_single_issue_uses_rest(self, creator):
+        """A single issue skips GraphQL entirely."""
+        with patch.object(creator, 'create_issue', return_value=7) as mock_create, \
+             patch.object(creator, '_graphql') as mock_graphql:
+            result = creator.create_issues_batch(self._issues(1))
+
+        assert result == [7]
+        mock_create.assert_called_once_with('T0', 'B', ['scn'])
+        mock_graphql.assert_not_called()
+
+    def test_batch_uses_aliased_mutation(self, creator):
+        """Multiple issues are created in one aliased mutation."""
+        response = {'data': {'i0': {'issue': {'number': 11}}, 'i1': {'issue': {'number': 12}}}}
+        with patch.object(creator, '_graphql', return_value=response) as mock_graphql, \
+             patch.object(creator, 'create_issue') as mock_create:
+            result = creator.create_issues_batch(self._issues(2))
+
+        assert result == [11, 12]
+        mock_create.assert_not_called()
+        query, variables = mock_graphql.call_args.args
+        assert 'i0: createIssue' in query and 'i1: createIssue' in query
+        assert variables['repo'] == 'R_1'
+        assert variables['l1'] == ['LA_1']
+
+    def test_batches_are_chunked(self, creator):
+        """Issues beyond GRAPHQL_BATCH_SIZE go into a second request."""
+        count = create_scn_issue.GRAPHQL_BATCH_SIZE + 1
+
+        def respond(query, variables, timeout):
+            return {'data': {
+                f'i{i}': {'issue': {'number': i + 1}}
+                for i in range(query.count('createIssue'))
+            }}
+
+        with patch.object(creator, '_graphql', side_effect=respond) as mock_graphql:
+            result = creator.create_issues_batch(self._issues(count))
+
+        assert mock_graphql.call_count == 2
+        assert len(result) == count
+        timeouts = [call.kwargs['timeout'] for call in mock_graphql.call_args_list]
+        assert timeouts[0] > timeouts[1] >= 30
+
+    def test_partial_failure_falls_back_to_rest(self, creator):
+        """Mutations that fail are retried through REST."""
+        response = {
+            'data': {'i0': {'issue': {'number': 21}}, 'i1': None},
+            'errors': [{'message': 'boom'}]
+        }
+        with patch.object(creator, '_graphql', return_value=response), \
+             patch.object(creator, 'create_issue', return_value=22) as mock_create:
+            result = creator.create_issues_batch(self._issues(2))
+
+        assert result == [21, 22]
+        mock_create.assert_called_once_with('T1', 'B', ['scn'])
+
+    @pytest.mark.parametrize("error", [
+        requests.ConnectionError('down'),
+        requests.ReadTimeout('slow'),
+        ValueError('bad JSON'),
+    ])
+    def test_request_error_not_replayed(self, creator, error, capsys):
+        """A failed mutation request is reported, not replayed through REST."""
+        with patch.object(creator, '_graphql', side_effect=error), \
+             patch.object(creator, 'create_issue') as mock_create:
+            result = creator.create_issues_batch(self._issues(2))
+
+        assert result == []
+        assert creator.failed_issue_count == 2
+        mock_create.assert_not_called()
+        assert 'not retried' in capsys.readouterr().err
+
+    def test_rejected_request_falls_back_to_rest(self, creator):
+        """A request rejected before execution (no data) goes through REST."""
+        response = {'errors': [{'message': 'Parse error'}]}
+        with patch.object(creator, '_graphql', return_value=response), \
+             patch.object(creator, 'create_issue', side_effect=[31, None]) as mock_create:
+            result = creator.create_issues_batch(self._issues(2))
+
+        assert result == [31]
+        assert mock_create.call_count == 2
+
+    def test_missing_alias_not_replayed(self, creator):
+        """Aliases absent from the response have an unknown outcome and are skipped."""
+        response = {'data': {'i0': {'issue': {'number': 41}}}}
+        with patch.object(creator, '_graphql', return_value=response), \
+             patch.object(creator, 'create_issue') as mock_create:
+            result = creator.create_issues_batch(self._issues(2))
+
+        assert result == [41]
+        mock_create.assert_not_called()
+
+    def test_node_id_lookup_failure_falls_back_to_rest(self, creator):
+        """Issues go through REST when node IDs cannot be fetched, before any mutation."""
+        creator._repository_id = None
+        with patch.object(creator, '_graphql', side_effect=requests.ConnectionError('down')) as mock_graphql, \
+             patch.object(creator, 'create_issue', side_effect=[51, 52]) as mock_create:
+            result = creator.create_issues_batch(self._issues(2))
+
+        assert result == [51, 52]
+        assert mock_create.call_count == 2
+        mock_graphql.assert_called_once()
+
+    def test_resolve_node_ids_creates_missing_labels(self, fake_response):
+        """Labels missing from the repo are created via REST once."""
+        creator = create_scn_issue.SCNIssueCreator('t', 'org/repo', 'https://github.com')
+        lookup = {'data': {'repository': {'id': 'R_9', 'l0': {'id': 'LA_scn'}, 'l1': None}}}
+        label_response = fake_response({'node_id': 'LA_new'})
+
+        with patch.object(creator, '_graphql', return_value=lookup) as mock_graphql, \
+             patch.object(creator.session, 'post', return_value=label_response) as mock_post:
+            assert creator._resolve_node_ids(['scn', 'scn:impact']) is True
+            assert creator._resolve_node_ids(['scn', 'scn:impact']) is True
+
+        mock_graphql.assert_called_once()
+        mock_post.assert_called_once()
+        assert mock_post.call_args.kwargs['json'] == {'name': 'scn:impact'}
+        assert creator._repository_id == 'R_9'
+        assert creator._label_ids == {'scn': 'LA_scn', 'scn:impact': 'LA_new'}
+
+
 class TestCreateIssuesForClassifications:
     """Test batch issue creation from classifications."""
 
@@ -330,10 +483,10 @@ class TestCreateIssuesForClassifications:
         assert issue_numbers == [100]
         mock_create.assert_called_once()
 
-    @patch.object(create_scn_issue.SCNIssueCreator, 'create_issue')
-    def test_mixed_classifications(self, mock_create, creator):
-        """Only non-routine classifications create issues."""
-        mock_create.side_effect = [101, 102]
+    @patch.object(create_scn_issue.SCNIssueCreator, 'create_issues_batch')
+    def test_mixed_classifications(self, mock_batch, creator):
+        """Only non-routine classifications create issues, in one batch."""
+        mock_batch.return_value = [101, 102]
         classifications = [
             {'category': 'ROUTINE', 'resource': 'r1', 'file': 'f1'},
             {
@@ -358,8 +511,13 @@ class TestCreateIssuesForClassifications:
 
         issue_numbers, _ = creator.create_issues_for_classifications(classifications, 1, '1')
 
-        assert len(issue_numbers) == 2
-        assert mock_create.call_count == 2
+        assert issue_numbers == [101, 102]
+        mock_batch.assert_called_once()
+        pending = mock_batch.call_args.args[0]
+        assert [issue['labels'] for issue in pending] == [
+            create_scn_issue.CATEGORY_LABELS['ADAPTIVE'],
+            create_scn_issue.CATEGORY_LABELS['IMPACT'],
+        ]
 
     @patch.object(create_scn_issue.SCNIssueCreator, 'create_issue')
     def test_empty_classifications(self, mock_create, creator):
@@ -368,6 +526,7 @@ class TestCreateIssuesForClassifications:
 
         assert issue_numbers == []
         mock_create.assert_not_called()
+        assert creator._session is None
 
     def test_dry_run_skips_api_calls(self, creator):
         """Dry-run collects payloads without calling create_issue."""
@@ -428,6 +587,22 @@ class TestCreateIssuesForClassifications:
         categories = {i['category'] for i in dry_run_issues}
         assert categories == {'ADAPTIVE', 'IMPACT'}
 
+    def test_due_dates_computed_once_per_category(self, creator):
+        """Due dates are calculated per category, not per classification."""
+        classifications = [
+            {'category': 'ADAPTIVE', 'resource': f'r{i}', 'file': 'f.tf', 'operation': 'modify'}
+            for i in range(3)
+        ]
+
+        with patch.object(creator, 'calculate_due_dates', wraps=creator.calculate_due_dates) as mock_dates:
+            _, dry_run_issues = creator.create_issues_for_classifications(
+                classifications, 1, '1', dry_run=True
+            )
+
+        assert len(dry_run_issues) == 3
+        mock_dates.assert_called_once_with('ADAPTIVE')
+        assert dry_run_issues[0]['labels'] == create_scn_issue.CATEGORY_LABELS['ADAPTIVE']
+
     @patch.dict(os.environ, {
         'GITHUB_EVENT_NAME': 'push',
         'GITHUB_REF': 'refs/heads/main',
@@ -586,3 +761,29 @@ class TestMainDryRun:
             result = create_scn_issue.main()
 
         assert result == 1
+
+
+class TestMainIssueFailures:
+    """Test main() exit status when issue creation fails."""
+
+    def test_failed_graphql_chunk_exits_nonzero(self, tmp_path, capsys):
+        """A chunk lost to a GraphQL transport error fails the run."""
+        input_file = tmp_path / 'classifications.json'
+        input_file.write_text(json.dumps({'classifications': [
+            {'category': 'ADAPTIVE', 'resource': f'aws_instance.web{i}', 'file': 'main.tf'}
+            for i in range(2)
+        ]}))
+
+        with patch.dict(os.environ, {'GITHUB_TOKEN': 'token'}), \
+             patch.object(create_scn_issue.SCNIssueCreator, '_create_issues_graphql',
+                          side_effect=requests.ReadTimeout('slow')), \
+             patch('sys.argv', [
+                 'create_scn_issue.py',
+                 '--input', str(input_file),
+                 '--repo', 'org/repo',
+                 '--run-id', '123',
+             ]):
+            result = create_scn_issue.main()
+
+        assert result == 1
+        assert '2 issue(s) may not have been created' in capsys.readouterr().err
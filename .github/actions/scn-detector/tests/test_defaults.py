@@ -3,22 +3,7 @@
 Tests for defaults module - centralized configuration
 """
 
-import importlib.util
-import sys
-from pathlib import Path
-
-# Add scripts directory to path
-REPO_ROOT = Path(__file__).resolve().parents[4]
-SCRIPTS_DIR = REPO_ROOT / ".github" / "actions" / "scn-detector" / "scripts"
-
-# Import defaults module dynamically
-spec = importlib.util.spec_from_file_location(
-    "defaults",
-    SCRIPTS_DIR / "defaults.py"
-)
-defaults = importlib.util.module_from_spec(spec)
-sys.modules["defaults"] = defaults
-spec.loader.exec_module(defaults)
+import defaults
 
 
 class TestDefaults:
@@ -3,22 +3,9 @@
 Tests for diff parsing helper functions.
 """
 
-import importlib.util
 import pytest
-import sys
-from pathlib import Path
-
-# Import module dynamically
-REPO_ROOT = Path(__file__).resolve().parents[4]
-SCRIPTS_DIR = REPO_ROOT / ".github" / "actions" / "scn-detector" / "scripts"
-
-spec = importlib.util.spec_from_file_location(
-    "diff_helpers",
-    SCRIPTS_DIR / "diff_helpers.py"
-)
-diff_helpers = importlib.util.module_from_spec(spec)
-sys.modules["diff_helpers"] = diff_helpers
-spec.loader.exec_module(diff_helpers)
+
+import diff_helpers
 
 
 pytestmark = pytest.mark.unit
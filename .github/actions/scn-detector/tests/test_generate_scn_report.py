@@ -3,23 +3,12 @@
 Tests for SCN report generation.
 """
 
-import importlib.util
 import json
 import pytest
-import sys
-from pathlib import Path
+import re
+from unittest.mock import patch
 
-# Import module dynamically
-REPO_ROOT = Path(__file__).resolve().parents[4]
-SCRIPTS_DIR = REPO_ROOT / ".github" / "actions" / "scn-detector" / "scripts"
-
-spec = importlib.util.spec_from_file_location(
-    "generate_scn_report",
-    SCRIPTS_DIR / "generate_scn_report.py"
-)
-generate_scn_report = importlib.util.module_from_spec(spec)
-sys.modules["generate_scn_report"] = generate_scn_report
-spec.loader.exec_module(generate_scn_report)
+import generate_scn_report
 
 
 pytestmark = pytest.mark.unit
@@ -90,6 +79,22 @@ class TestSCNReportGenerator:
         assert generator.run_id == '12345'
         assert len(generator.classifications) == 3
 
+    def test_classifications_bucketed_by_category(self, generator):
+        """Classifications are grouped by category in the shared model."""
+        by_category = generator._model['by_category']
+        assert [c['resource'] for c in by_category['ADAPTIVE']] == ['aws_instance.app']
+        assert 'IMPACT' not in by_category
+
+    def test_model_built_once_for_both_outputs(self, generator):
+        """Markdown and audit JSON renderers share one materialized model."""
+        with patch.object(generator, '_compute_highest_severity',
+                          wraps=generator._compute_highest_severity) as mock_severity:
+            generator.generate_pr_comment()
+            audit = generator.generate_audit_json()
+
+        mock_severity.assert_called_once()
+        assert audit['highest_severity'] == 'TRANSFORMATIVE'
+
     def test_get_highest_severity_transformative(self, generator):
         """Highest severity is TRANSFORMATIVE when present."""
         assert generator.get_highest_severity() == 'TRANSFORMATIVE'
@@ -155,6 +160,14 @@ class TestSummaryTable:
         assert 'Adaptive' in table
         assert 'Routine' in table
 
+    def test_table_uses_precomputed_timelines(self, generator):
+        """Timeline strings are computed at init, not per table render."""
+        with patch.object(generator, 'format_timeline_requirements') as mock_format:
+            table = generator.generate_summary_table()
+
+        mock_format.assert_not_called()
+        assert generator._timeline_strings['ADAPTIVE'] in table
+
     def test_table_has_counts(self, generator):
         """Summary table shows correct counts."""
         table = generator.generate_summary_table()
@@ -170,6 +183,11 @@ class TestCategorySections:
         result = generator.generate_category_section('IMPACT')
         assert result == ''
 
+    def test_empty_category_skips_model(self, generator):
+        """Empty categories short-circuit without materializing the model."""
+        generator.generate_category_section('IMPACT')
+        assert '_model' not in vars(generator)
+
     def test_adaptive_section_has_timeline(self, generator):
         """ADAPTIVE section mentions notification timeline."""
         result = generator.generate_category_section('ADAPTIVE')
@@ -186,6 +204,24 @@ class TestCategorySections:
         assert 'aws_instance.web' in result
 
 
+class TestConfidenceDisplay:
+    """Test confidence percentage rendering."""
+
+    @pytest.mark.parametrize('confidence,expected', [
+        (1.0, '100%'),
+        (0.92, '92%'),
+        (0.875, '88%'),
+        (0.0, '0%'),
+        (float('nan'), 'nan%'),
+        (float('inf'), 'inf%'),
+    ])
+    def test_confidence_rounded_to_whole_percent(self, generator, confidence, expected):
+        """Confidence is shown as a rounded whole percentage; NaN/inf do not raise."""
+        item = {'resource': 'r', 'file': 'f', 'method': 'rule-based', 'confidence': confidence}
+        assert f'(confidence: {expected})' in generator._format_change_item(item, 1)
+        assert f'(confidence: {expected})' in generator._format_change_collapsible(item, 1)
+
+
 class TestPRComment:
     """Test generate_pr_comment."""
 
@@ -232,6 +268,12 @@ class TestAuditJSON:
         assert meta['pull_request'] == 42
         assert meta['run_id'] == '12345'
 
+    def test_audit_timestamp_matches_markdown(self, generator):
+        """Audit JSON and PR comment report the same analysis timestamp."""
+        timestamp = generator.generate_audit_json()['analysis_metadata']['timestamp']
+        assert re.fullmatch(r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z', timestamp)
+        assert f'**Analysis Date**: {timestamp}' in generator.generate_pr_comment()
+
     def test_audit_json_compliance_actions(self, generator):
         """Compliance actions generated for non-routine categories."""
         audit = generator.generate_audit_json()
@@ -290,3 +332,69 @@ class TestEdgeCases:
         )
         audit = gen.generate_audit_json()
         assert audit['analysis_metadata']['pull_request'] is None
+
+
+class TestMain:
+    """Test main() CLI file handling."""
+
+    def test_main_writes_reports(self, tmp_path, sample_classifications, has_orjson):
+        """main() reads input JSON and writes markdown and audit JSON."""
+        input_file = tmp_path / 'classifications.json'
+        input_file.write_text(json.dumps(sample_classifications))
+        output_md = tmp_path / 'out' / 'report.md'
+        output_json = tmp_path / 'out' / 'audit.json'
+
+        with patch('sys.argv', [
+            'generate_scn_report.py',
+            '--input', str(input_file),
+            '--output-md', str(output_md),
+            '--output-json', str(output_json),
+            '--repo', 'org/repo',
+            '--run-id', '1',
+        ]):
+            result = generate_scn_report.main()
+
+        assert result == 0
+        assert 'Change Summary' in output_md.read_text(encoding='utf-8')
+        audit = json.loads(output_json.read_text(encoding='utf-8'))
+        assert audit['highest_severity'] == 'TRANSFORMATIVE'
+        assert audit['classifications'] == sample_classifications['classifications']
+
+    @pytest.mark.parametrize('pretty', [True, False])
+    def test_main_audit_formatting(self, tmp_path, sample_classifications, has_orjson, pretty):
+        """Audit JSON is compact by default and indented with --pretty-audit."""
+        input_file = tmp_path / 'classifications.json'
+        input_file.write_text(json.dumps(sample_classifications))
+        output_json = tmp_path / 'audit.json'
+        argv = [
+            'generate_scn_report.py',
+            '--input', str(input_file),
+            '--output-md', str(tmp_path / 'report.md'),
+            '--output-json', str(output_json),
+            '--repo', 'org/repo',
+            '--run-id', '1',
+        ]
+        if pretty:
+            argv.append('--pretty-audit')
+
+        with patch('sys.argv', argv):
+            assert generate_scn_report.main() == 0
+
+        text = output_json.read_text(encoding='utf-8')
+        assert ('\n  "version"' in text) is pretty
+        assert json.loads(text)['summary'] == sample_classifications['summary']
+
+    def test_main_invalid_json(self, tmp_path, has_orjson):
+        """Invalid input JSON returns 1."""
+        input_file = tmp_path / 'classifications.json'
+        input_file.write_text('{not json')
+
+        with patch('sys.argv', [
+            'generate_scn_report.py',
+            '--input', str(input_file),
+            '--output-md', str(tmp_path / 'report.md'),
+            '--output-json', str(tmp_path / 'audit.json'),
+            '--repo', 'org/repo',
+            '--run-id', '1',
+        ]):
+            assert generate_scn_report.main() == 1
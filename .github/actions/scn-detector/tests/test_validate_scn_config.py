@@ -3,43 +3,22 @@
 Tests for SCN config validation
 """
 
-import importlib.util
 import json
 import os
 import pytest
-import sys
-from pathlib import Path
+import yaml
 from unittest.mock import patch
 
-# Add scripts directory to path
-REPO_ROOT = Path(__file__).resolve().parents[4]
-SCRIPTS_DIR = REPO_ROOT / '.github' / 'actions' / 'scn-detector' / 'scripts'
-PROFILES_DIR = REPO_ROOT / '.github' / 'actions' / 'scn-detector' / 'profiles'
-SCHEMAS_DIR = REPO_ROOT / '.github' / 'actions' / 'scn-detector' / 'schemas'
-FIXTURES_DIR = REPO_ROOT / 'tests' / 'fixtures' / 'scn-detector'
-
-if str(SCRIPTS_DIR) not in sys.path:
-    sys.path.insert(0, str(SCRIPTS_DIR))
-
-# Import validate_scn_config module dynamically
-spec = importlib.util.spec_from_file_location(
-    'validate_scn_config',
-    SCRIPTS_DIR / 'validate_scn_config.py'
-)
-validate_scn_config = importlib.util.module_from_spec(spec)
-sys.modules['validate_scn_config'] = validate_scn_config
-spec.loader.exec_module(validate_scn_config)
+import validate_scn_config
 
-import yaml
 
 # Mark all tests as unit tests
 pytestmark = pytest.mark.unit
 
 
 @pytest.fixture
-def schema():
+def schema(schema_path):
     """Load the SCN config schema."""
-    schema_path = SCHEMAS_DIR / 'scn-config.schema.json'
     with open(schema_path, 'r') as f:
         return json.load(f)
 
@@ -174,8 +153,9 @@ class TestValidateConfigStructure:
                 'critical': [{'pattern': 'x', 'description': 'x'}]
             }
         }
-        with pytest.raises(ValueError, match='unknown category "critical"'):
+        with pytest.raises(ValueError, match='unknown category "critical"') as exc_info:
             validate_scn_config.validate_config_structure(config, schema)
+        assert '(valid: adaptive, impact, routine, transformative)' in str(exc_info.value)
 
     def test_rules_category_not_list(self, schema):
         """Non-list category value raises error."""
@@ -221,6 +201,15 @@ class TestValidateConfigStructure:
         with pytest.raises(ValueError, match='at least one of pattern, resource, or attribute'):
             validate_scn_config.validate_config_structure(config, schema)
 
+    def test_rules_rule_null_field_not_string(self, schema):
+        """Explicit null criterion is reported, not treated as absent."""
+        config = {
+            'version': '1.0',
+            'rules': {'routine': [{'description': 'Null pattern', 'pattern': None}]}
+        }
+        with pytest.raises(ValueError, match=r'rules\.routine\[0\]\.pattern: must be a string'):
+            validate_scn_config.validate_config_structure(config, schema)
+
     def test_rules_rule_valid_pattern_only(self, schema):
         """Rule with only pattern + description passes."""
         config = {
@@ -364,6 +353,18 @@ class TestValidateNotifications:
         with pytest.raises(ValueError, match='unknown key "critical"'):
             validate_scn_config.validate_config_structure(minimal_valid_config, schema)
 
+    @pytest.mark.parametrize('key,field,value,type_name', [
+        ('adaptive', 'post_completion_days', 'ten', 'an integer'),
+        ('transformative', 'post_completion_required', 'yes', 'a boolean'),
+        ('impact', 'description', 42, 'a string'),
+    ])
+    def test_notifications_field_wrong_type(self, schema, minimal_valid_config,
+                                            key, field, value, type_name):
+        """Notification fields are type-checked per category."""
+        minimal_valid_config['notifications'] = {key: {field: value}}
+        with pytest.raises(ValueError, match=f'notifications.{key}.{field}: must be {type_name}'):
+            validate_scn_config.validate_config_structure(minimal_valid_config, schema)
+
     def test_notifications_not_dict(self, schema, minimal_valid_config):
         """Non-dict notifications raises error."""
         minimal_valid_config['notifications'] = 'not a dict'
@@ -393,6 +394,16 @@ class TestValidateIssueTemplates:
         with pytest.raises(ValueError, match='issue_templates: must be a mapping'):
             validate_scn_config.validate_config_structure(minimal_valid_config, schema)
 
+    def test_issue_templates_label_fields_wrong_type(self, schema, minimal_valid_config):
+        """Label prefix and category names must be strings."""
+        minimal_valid_config['issue_templates'] = {
+            'labels': {'prefix': 1, 'categories': {'adaptive': 2}}
+        }
+        with pytest.raises(ValueError) as exc_info:
+            validate_scn_config.validate_config_structure(minimal_valid_config, schema)
+        assert 'issue_templates.labels.prefix: must be a string' in str(exc_info.value)
+        assert 'issue_templates.labels.categories.adaptive: must be a string' in str(exc_info.value)
+
     def test_issue_templates_checklist_not_strings(self, schema, minimal_valid_config):
         """Checklist with non-string items raises error."""
         minimal_valid_config['issue_templates'] = {
@@ -436,7 +447,7 @@ class TestValidateAiConfigStructure:
 class TestMainFunction:
     """Test standalone main() execution."""
 
-    def test_main_valid_config(self, tmp_path):
+    def test_main_valid_config(self, tmp_path, monkeypatch, schema_path):
         """Valid config exits 0."""
         config_file = tmp_path / 'config.yml'
         config_file.write_text(
@@ -446,52 +457,52 @@ class TestMainFunction:
             '    - pattern: "tags.*"\n'
             '      description: "Tag changes"\n'
         )
-        schema_path = SCHEMAS_DIR / 'scn-config.schema.json'
-
-        with patch.dict(os.environ, {
-            'CONFIG_FILE': str(config_file),
-            'SCHEMA_FILE': str(schema_path),
-            'AI_CONFIG_FILE': '',
-        }):
-            with pytest.raises(SystemExit) as exc_info:
-                validate_scn_config.main()
-            assert exc_info.value.code == 0
-
-    def test_main_invalid_config(self, tmp_path):
+
+        monkeypatch.setenv('CONFIG_FILE', str(config_file))
+        monkeypatch.setenv('SCHEMA_FILE', str(schema_path))
+        monkeypatch.setenv('AI_CONFIG_FILE', '')
+
+        with pytest.raises(SystemExit) as exc_info:
+            validate_scn_config.main()
+        assert exc_info.value.code == 0
+
+    def test_main_invalid_config(self, tmp_path, monkeypatch, schema_path):
         """Invalid config exits 1."""
         config_file = tmp_path / 'bad-config.yml'
         config_file.write_text('rules: []\n')
-        schema_path = SCHEMAS_DIR / 'scn-config.schema.json'
-
-        with patch.dict(os.environ, {
-            'CONFIG_FILE': str(config_file),
-            'SCHEMA_FILE': str(schema_path),
-            'AI_CONFIG_FILE': '',
-        }):
-            with pytest.raises(SystemExit) as exc_info:
-                validate_scn_config.main()
-            assert exc_info.value.code == 1
-
-    def test_main_missing_config_file_env(self):
+
+        monkeypatch.setenv('CONFIG_FILE', str(config_file))
+        monkeypatch.setenv('SCHEMA_FILE', str(schema_path))
+        monkeypatch.setenv('AI_CONFIG_FILE', '')
+
+        with pytest.raises(SystemExit) as exc_info:
+            validate_scn_config.main()
+        assert exc_info.value.code == 1
+
+    def test_main_missing_config_file_env(self, monkeypatch):
         """Missing CONFIG_FILE env var exits 1."""
-        with patch.dict(os.environ, {}, clear=True):
-            with pytest.raises(SystemExit) as exc_info:
-                validate_scn_config.main()
-            assert exc_info.value.code == 1
+        monkeypatch.delenv('CONFIG_FILE', raising=False)
+        monkeypatch.delenv('SCHEMA_FILE', raising=False)
+        monkeypatch.delenv('AI_CONFIG_FILE', raising=False)
+
+        with pytest.raises(SystemExit) as exc_info:
+            validate_scn_config.main()
+        assert exc_info.value.code == 1
 
-    def test_main_missing_schema_file_env(self, tmp_path):
+    def test_main_missing_schema_file_env(self, tmp_path, monkeypatch):
         """Missing SCHEMA_FILE env var exits 1."""
         config_file = tmp_path / 'config.yml'
         config_file.write_text('version: "1.0"\nrules:\n  routine:\n    - pattern: "x"\n      description: "x"\n')
 
-        with patch.dict(os.environ, {
-            'CONFIG_FILE': str(config_file),
-        }, clear=True):
-            with pytest.raises(SystemExit) as exc_info:
-                validate_scn_config.main()
-            assert exc_info.value.code == 1
+        monkeypatch.delenv('SCHEMA_FILE', raising=False)
+        monkeypatch.delenv('AI_CONFIG_FILE', raising=False)
+        monkeypatch.setenv('CONFIG_FILE', str(config_file))
+
+        with pytest.raises(SystemExit) as exc_info:
+            validate_scn_config.main()
+        assert exc_info.value.code == 1
 
-    def test_main_with_ai_config(self, tmp_path):
+    def test_main_with_ai_config(self, tmp_path, monkeypatch, schema_path):
         """Valid config with AI config exits 0."""
         config_file = tmp_path / 'config.yml'
         config_file.write_text(
@@ -507,53 +518,95 @@ class TestMainFunction:
             'model: "claude-3-haiku-20240307"\n'
             'confidence_threshold: 0.8\n'
         )
-        schema_path = SCHEMAS_DIR / 'scn-config.schema.json'
 
-        with patch.dict(os.environ, {
-            'CONFIG_FILE': str(config_file),
-            'SCHEMA_FILE': str(schema_path),
-            'AI_CONFIG_FILE': str(ai_config_file),
-        }):
-            with pytest.raises(SystemExit) as exc_info:
-                validate_scn_config.main()
-            assert exc_info.value.code == 0
+        monkeypatch.setenv('CONFIG_FILE', str(config_file))
+        monkeypatch.setenv('SCHEMA_FILE', str(schema_path))
+        monkeypatch.setenv('AI_CONFIG_FILE', str(ai_config_file))
+
+        with pytest.raises(SystemExit) as exc_info:
+            validate_scn_config.main()
+        assert exc_info.value.code == 0
+
+
+class TestLoadConfig:
+    """Test load_config file parsing."""
+
+    def test_load_json_config(self, tmp_path, has_orjson):
+        """JSON configs parse with and without orjson."""
+        config_file = tmp_path / 'config.json'
+        config_file.write_text(json.dumps({'version': '1.0', 'rules': {}}))
+
+        config = validate_scn_config.load_config(str(config_file))
+
+        assert config == {'version': '1.0', 'rules': {}}
+
+    def test_load_yaml_config(self, tmp_path):
+        """YAML configs parse; empty files load as an empty dict."""
+        config_file = tmp_path / 'config.yml'
+        config_file.write_text('version: "1.0"\n')
+        empty_file = tmp_path / 'empty.yml'
+        empty_file.write_text('')
+
+        assert validate_scn_config.load_config(str(config_file)) == {'version': '1.0'}
+        assert validate_scn_config.load_config(str(empty_file)) == {}
+
+    def test_load_yaml_config_utf8_bytes(self, tmp_path):
+        """Non-ASCII YAML is decoded correctly from raw bytes."""
+        config_file = tmp_path / 'config.yml'
+        config_file.write_bytes('name: "Profil détaillé ✓"\n'.encode('utf-8'))
+
+        assert validate_scn_config.load_config(str(config_file)) == {'name': 'Profil détaillé ✓'}
+
+    def test_yaml_loader_is_safe(self):
+        """YAML is parsed with a safe loader (libyaml when available)."""
+        assert validate_scn_config._SafeLoader in (yaml.SafeLoader, getattr(yaml, 'CSafeLoader', None))
+        with pytest.raises(yaml.YAMLError):
+            yaml.load('!!python/object/apply:os.system ["true"]', Loader=validate_scn_config._SafeLoader)
+
+    def test_load_unsupported_extension(self, tmp_path):
+        """Unsupported extensions raise ValueError."""
+        config_file = tmp_path / 'config.toml'
+        config_file.write_text('')
+
+        with pytest.raises(ValueError, match='Unsupported config file type'):
+            validate_scn_config.load_config(str(config_file))
 
 
 class TestFixtureConfigs:
     """Test validation against existing fixture/profile configs."""
 
-    def test_validate_fedramp_low_profile(self, schema):
+    def test_validate_fedramp_low_profile(self, schema, profiles_dir):
         """Built-in FedRAMP Low profile passes validation."""
-        profile_path = PROFILES_DIR / 'fedramp-low.yml'
+        profile_path = profiles_dir / 'fedramp-low.yml'
         with open(profile_path, 'r') as f:
             config = yaml.safe_load(f)
         validate_scn_config.validate_config_structure(config, schema)
 
-    def test_validate_minimal_fixture(self, schema):
+    def test_validate_minimal_fixture(self, schema, fixtures_dir):
         """Minimal fixture config passes validation."""
-        fixture_path = FIXTURES_DIR / 'config' / 'scn-config-minimal.yml'
+        fixture_path = fixtures_dir / 'config' / 'scn-config-minimal.yml'
         with open(fixture_path, 'r') as f:
             config = yaml.safe_load(f)
         validate_scn_config.validate_config_structure(config, schema)
 
-    def test_validate_openai_fixture(self, schema):
+    def test_validate_openai_fixture(self, schema, fixtures_dir):
         """OpenAI fixture config passes validation."""
-        fixture_path = FIXTURES_DIR / 'config' / 'scn-config-openai.yml'
+        fixture_path = fixtures_dir / 'config' / 'scn-config-openai.yml'
         with open(fixture_path, 'r') as f:
             config = yaml.safe_load(f)
         validate_scn_config.validate_config_structure(config, schema)
 
-    def test_invalid_no_version_fixture(self, schema):
+    def test_invalid_no_version_fixture(self, schema, fixtures_dir):
         """No-version fixture fails validation."""
-        fixture_path = FIXTURES_DIR / 'config' / 'scn-config-invalid-no-version.yml'
+        fixture_path = fixtures_dir / 'config' / 'scn-config-invalid-no-version.yml'
         with open(fixture_path, 'r') as f:
             config = yaml.safe_load(f)
         with pytest.raises(ValueError, match='version: required field missing'):
             validate_scn_config.validate_config_structure(config, schema)
 
-    def test_invalid_bad_rules_fixture(self, schema):
+    def test_invalid_bad_rules_fixture(self, schema, fixtures_dir):
         """Bad-rules fixture fails validation."""
-        fixture_path = FIXTURES_DIR / 'config' / 'scn-config-invalid-bad-rules.yml'
+        fixture_path = fixtures_dir / 'config' / 'scn-config-invalid-bad-rules.yml'
         with open(fixture_path, 'r') as f:
             config = yaml.safe_load(f)
         with pytest.raises(ValueError) as exc_info:
@@ -563,9 +616,9 @@ class TestFixtureConfigs:
         assert 'description: required field missing' in error_msg
         assert 'at least one of pattern, resource, or attribute' in error_msg
 
-    def test_validate_custom_example(self, schema):
+    def test_validate_custom_example(self, schema, repo_root):
         """Custom example profile passes validation."""
-        example_path = REPO_ROOT / 'examples' / 'configs' / 'scn-profile-custom.example.yml'
+        example_path = repo_root / 'examples' / 'configs' / 'scn-profile-custom.example.yml'
         with open(example_path, 'r') as f:
             config = yaml.safe_load(f)
         validate_scn_config.validate_config_structure(config, schema)